@@ -1,4 +1,6 @@
+import atexit
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -68,30 +70,81 @@ CREATE INDEX IF NOT EXISTS idx_repayments_company_due ON repayments(company_id,
 CREATE INDEX IF NOT EXISTS idx_repayments_worker_due ON repayments(worker_id, due_date);
 """
 
+# Created after migrations, since older databases gain payments.worker_id there.
+# Each matches a hot filter + ORDER BY created_at, so history loads are an
+# index range walk instead of a scan and sort.
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_payments_country_status_created ON payments(country_id, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_payments_worker_status_created ON payments(worker_id, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_settlements_created ON settlements(created_at);
+"""
+
+
+# Set once on every new connection (journal_mode=WAL also persists in the file)
+CONNECTION_PRAGMAS = (
+    "PRAGMA page_size=8192",           # only takes effect on a new, empty file
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",      # 256 MiB memory-mapped reads
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128); the
+# routes reuse a fixed set of SQL strings, so they compile once per thread
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+_connections: list[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+
 
 def _connect() -> sqlite3.Connection:
     db_path = Path(settings.db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _thread_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+        with _connections_lock:
+            _connections.append(conn)
     return conn
 
 
+@atexit.register
+def close_connections() -> None:
+    with _connections_lock:
+        while _connections:
+            _connections.pop().close()
+    _local.__dict__.pop("conn", None)
+
+
 @contextmanager
 def get_db():
-    conn = _connect()
+    """Yield this thread's persistent connection; commit on success, roll back on error."""
+    conn = _thread_connection()
     try:
         yield conn
-        conn.commit()
-    finally:
-        conn.close()
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
 
 
 def init_db() -> None:
     with get_db() as conn:
         conn.executescript(SCHEMA_SQL)
         _apply_migrations(conn)
+        conn.executescript(INDEX_SQL)
         _seed(conn)
+        conn.execute("ANALYZE")
 
 
 def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
@@ -111,18 +164,14 @@ def _apply_migrations(conn: sqlite3.Connection) -> None:
 
 def _seed(conn: sqlite3.Connection) -> None:
     countries = [("COUNTRY_A", "Country A"), ("COUNTRY_B", "Country B")]
-    for code, name in countries:
-        conn.execute(
-            "INSERT OR IGNORE INTO countries(code, name) VALUES (?, ?)",
-            (code, name),
-        )
-
-    rows = conn.execute("SELECT id FROM countries").fetchall()
-    for row in rows:
-        conn.execute(
-            "INSERT OR IGNORE INTO pools(country_id, balance_minor, currency) VALUES (?, 0, ?)",
-            (row["id"], settings.default_currency),
-        )
+    conn.executemany(
+        "INSERT OR IGNORE INTO countries(code, name) VALUES (?, ?)",
+        countries,
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO pools(country_id, balance_minor, currency) SELECT id, 0, ? FROM countries",
+        (settings.default_currency,),
+    )
 
 
 def reset_demo_data() -> None:
@@ -15,15 +15,20 @@ Quick start:
 
 Architecture:
     adapters/       Concrete data-source adapters (Open Banking, Stripe …)
-    models.py       Canonical data models (EarningRecord, IncomeSmoothing)
+    models.py       Canonical data models (EarningRecord, EarningBatch, IncomeSmoothing)
     interfaces.py   Abstract contracts every adapter & service must satisfy
     smoothing.py    Income smoothing  B = (1/N) × Σ Eₜ  with δ tolerance
     pipeline.py     Orchestrator: adapters → merge → smooth → output
     run.py          CLI entry-point with CSV export + per-account report
     data/           Sample transaction files
+
+Requires numpy (declared in the project dependencies): `EarningBatch`,
+the smoothing reductions and the CLI's amount parsing are columnar.
+Unlike the legacy app, where NumPy only speeds up large inputs, there is
+no pure-Python path here.
 """
 
-from .models import EarningRecord, EarningSourceType, IncomeSmoothing, IncomeState
+from .models import EarningBatch, EarningRecord, EarningSourceType, IncomeSmoothing, IncomeState
 from .interfaces import IDataSourceAdapter, IIncomeSmoothingService, IRecordSink
 from .smoothing import IncomeSmoothingService
 from .pipeline import IngestionPipeline
@@ -32,6 +37,7 @@ from .adapters.stripe import StripeAdapter
 
 __all__ = [
     # Models
+    "EarningBatch",
     "EarningRecord",
     "EarningSourceType",
     "IncomeSmoothing",
@@ -47,7 +47,7 @@ class OpenBankingAdapter(IDataSourceAdapter):
 
             # ── Date parsing (bookingDateTime > bookingDate) ──────────
             date_str = tx.get("bookingDateTime") or tx.get("bookingDate", "")
-            earned_at = self._parse_date(date_str)
+            earned_at = self.parse_date(date_str)
 
             # ── Labels ────────────────────────────────────────────────
             label   = tx.get("remittanceInformationUnstructured", "unknown")
@@ -71,8 +71,8 @@ class OpenBankingAdapter(IDataSourceAdapter):
     # ── Helpers ───────────────────────────────────────────────────────
 
     @staticmethod
-    def _parse_date(date_str: str) -> datetime:
-        """Parse ISO date or datetime, fall back to now()."""
+    def parse_date(date_str: str) -> datetime:
+        """Parse ISO date or datetime, fall back to now() (also used by `run`)."""
         try:
             if "T" in date_str:
                 return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
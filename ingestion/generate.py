@@ -18,6 +18,8 @@ Usage:
     python3 -m ingestion.generate
     python3 ingestion/generate.py
     python3 ingestion/generate.py --workers 500 --seed 42
+
+Requires numpy (earnings history is held column-wise in `EarningsBlock`).
 """
 from __future__ import annotations
 
@@ -25,12 +27,15 @@ import argparse
 import csv
 import json
 import os
-import random
-import statistics
-from dataclasses import asdict, dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 
 # ── Constants ─────────────────────────────────────────────────────────
@@ -51,6 +56,26 @@ COUNTRY_LIST = list(COUNTRIES.keys())  # ["DE", "TR"]
 # FX rate (approximate Feb 2026)
 EUR_TO_TRY = 38.50
 
+# "YYYY-MM" labels counting back from Feb 2026 (index k = k months ago),
+# shared by every worker instead of formatting dates per month
+MONTH_STRINGS = [
+    f"{(2026 * 12 + 1 - k) // 12}-{(2026 * 12 + 1 - k) % 12 + 1:02d}"
+    for k in range(36)
+]
+
+# Reference "today" for the dataset; every generated date is an offset from it
+REF_DATE = datetime(2026, 2, 22)
+
+# "YYYY-MM-DD" strings for REF_DATE − k days, looked up via `_date_str(k)`.
+# k runs from −DATE_FUTURE_DAYS (repayments fall due / get repaid up to ~60
+# days after REF_DATE) to DATE_PAST_DAYS (oldest registration is 3 years back).
+DATE_FUTURE_DAYS = 90
+DATE_PAST_DAYS = 3 * 365 + 30
+DATE_STRS = [
+    (REF_DATE - timedelta(days=k)).strftime("%Y-%m-%d")
+    for k in range(-DATE_FUTURE_DAYS, DATE_PAST_DAYS + 1)
+]
+
 # Per-archetype probability of being an FX sender (~50% of each group,
 # but biased towards workers with positive disposable income)
 FX_PARTICIPATION = {
@@ -131,7 +156,19 @@ class IncomeState(Enum):
     FAMINE = "FAMINE"
 
 
+# Status strings stored on every AdvanceRepayment. All records share these
+# objects, so the status filters in _compute_risk_features hit the identity
+# fast path of str equality without an enum attribute lookup per record.
+STATUS_ON_TIME   = RepaymentStatus.REPAID_ON_TIME.value
+STATUS_LATE      = RepaymentStatus.REPAID_LATE.value
+STATUS_DEFAULTED = RepaymentStatus.DEFAULTED.value
+
+
 # ── Data Classes ──────────────────────────────────────────────────────
+#
+# `__slots__` is spelled out rather than passed as `slots=True` (3.10+);
+# classes with defaulted fields stay plain, since a class-level default
+# would clash with its slot.
 
 @dataclass
 class MonthlyEarning:
@@ -145,8 +182,47 @@ class MonthlyEarning:
     country: str = "DE"
 
 
+@dataclass
+class EarningsBlock:
+    """Column-wise earnings history for one worker (index i = month i).
+
+    Aggregations run on the float arrays directly; `MonthlyEarning`
+    rows are only materialised on export.
+    """
+    __slots__ = (
+        "worker_id", "currency", "country", "months",
+        "gross", "fees", "net", "prev_net",
+    )
+
+    worker_id: str
+    currency: str
+    country: str
+    months: List[str]
+    gross: np.ndarray
+    fees: np.ndarray
+    net: np.ndarray
+    prev_net: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Yield one tuple per month in `MonthlyEarning` field order."""
+        n = len(self.months)
+        return zip(
+            [self.worker_id] * n, self.months,
+            self.gross.tolist(), self.fees.tolist(), self.net.tolist(),
+            [self.currency] * n, self.prev_net.tolist(), [self.country] * n,
+        )
+
+    def records(self) -> List[MonthlyEarning]:
+        return [MonthlyEarning(*row) for row in self.rows()]
+
+
 @dataclass
 class MonthlyExpense:
+    __slots__ = ("worker_id", "month", "rent", "transport", "food", "insurance", "total")
+
     worker_id: str
     month: str
     rent: float
@@ -158,6 +234,11 @@ class MonthlyExpense:
 
 @dataclass
 class AdvanceRepayment:
+    __slots__ = (
+        "advance_id", "worker_id", "amount", "date_issued",
+        "date_due", "date_repaid", "status", "days_late",
+    )
+
     advance_id: str
     worker_id: str
     amount: float
@@ -171,6 +252,12 @@ class AdvanceRepayment:
 @dataclass
 class FxTransaction:
     """Cross-border FX transfer (DE↔TR via Stripe)."""
+    __slots__ = (
+        "tx_id", "stripe_payment_intent", "worker_id", "date",
+        "amount_sent", "currency_sent", "amount_received", "currency_received",
+        "exchange_rate", "destination_country", "status",
+    )
+
     tx_id: str
     stripe_payment_intent: str    # Stripe pi_... reference
     worker_id: str
@@ -195,7 +282,7 @@ class WorkerProfile:
     registration_date: str
     archetype: str
     months_active: int
-    earnings: List[MonthlyEarning] = field(default_factory=list)
+    earnings: EarningsBlock
     expenses: List[MonthlyExpense] = field(default_factory=list)
     repayments: List[AdvanceRepayment] = field(default_factory=list)
     fx_transactions: List[FxTransaction] = field(default_factory=list)
@@ -214,6 +301,11 @@ class WorkerProfile:
 
 @dataclass
 class ArchetypeConfig:
+    __slots__ = (
+        "name", "count", "earning_range", "volatility", "months_range",
+        "repayment_range", "on_time_prob", "default_prob", "expense_ratio", "trend",
+    )
+
     name: Archetype
     count: int
     earning_range: Tuple[float, float]
@@ -258,6 +350,29 @@ ARCHETYPES: List[ArchetypeConfig] = [
 ]
 
 
+# Special chars normalised away in generated email addresses
+_EMAIL_TR_TABLE = str.maketrans({
+    "ü": "u", "ö": "o", "ş": "s", "ç": "c", "ğ": "g",
+    "ı": "i", "İ": "i", "ä": "a", " ": "", "'": "",
+})
+
+
+@lru_cache(maxsize=None)
+def _email_part(name: str) -> str:
+    """Lower-cased, ASCII-normalised name for the local part of an email."""
+    return name.lower().translate(_EMAIL_TR_TABLE)
+
+
+def _date_str(days_back: int) -> str:
+    """"YYYY-MM-DD" for `days_back` days before REF_DATE (negative = after)."""
+    return DATE_STRS[days_back + DATE_FUTURE_DAYS]
+
+
+def _mean(values: List[float]) -> float:
+    """Arithmetic mean of a non-empty list (plain float math, unlike `statistics.mean`)."""
+    return sum(values) / len(values)
+
+
 # ── Generator Class ───────────────────────────────────────────────────
 
 class WorkerDatasetGenerator:
@@ -266,7 +381,7 @@ class WorkerDatasetGenerator:
     def __init__(self, total_workers: int = 500, seed: int = 42):
         self.total_workers = total_workers
         self.seed = seed
-        self.rng = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
         self.workers: List[WorkerProfile] = []
         self._advance_counter = 0
 
@@ -281,24 +396,33 @@ class WorkerDatasetGenerator:
                 self.archetype_counts.append(n)
                 remaining -= n
 
+        # Identity draws for every worker up front, one vectorised call per
+        # field; `_make_identity` only indexes into them.
+        n = total_workers
+        self._id_country = self.rng.integers(len(COUNTRY_LIST), size=n).tolist()
+        self._id_first_u = self.rng.random(n).tolist()   # scaled to the country's name pool
+        self._id_last_u = self.rng.random(n).tolist()
+        self._id_gmail = (self.rng.random(n) > 0.4).tolist()
+        self._id_days_ago = self.rng.integers(365, 365 * 3 + 1, size=n).tolist()
+
+    def _randint(self, a: int, b: int) -> int:
+        """Integer in [a, b] inclusive (random.randint semantics)."""
+        return int(self.rng.integers(a, b + 1))
+
     def _make_identity(self, idx: int) -> Tuple[str, str, str, str, str, str]:
+        i = idx - 1
         worker_id = f"WRK-{idx:06d}"
-        country = self.rng.choice(COUNTRY_LIST)  # ~50/50 DE or TR
+        country = COUNTRY_LIST[self._id_country[i]]  # ~50/50 DE or TR
         currency = COUNTRIES[country]["currency"]
         firsts, lasts = NAMES_BY_COUNTRY[country]
-        first = self.rng.choice(firsts)
-        last = self.rng.choice(lasts)
+        first = firsts[int(self._id_first_u[i] * len(firsts))]
+        last = lasts[int(self._id_last_u[i] * len(lasts))]
         name = f"{first} {last}"
-        email = f"{first.lower()}.{last.lower()}@{'gmail' if self.rng.random() > 0.4 else 'outlook'}.com"
-        # Normalise special chars for email
-        for old, new in [("ü", "u"), ("ö", "o"), ("ş", "s"), ("ç", "c"), ("ğ", "g"),
-                         ("ı", "i"), ("İ", "i"), ("ä", "a"), (" ", ""), ("'", "")]:
-            email = email.replace(old, new)
-        days_ago = self.rng.randint(365, 365 * 3)
-        reg_date = (datetime(2026, 2, 22) - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+        email = f"{_email_part(first)}.{_email_part(last)}@{'gmail' if self._id_gmail[i] else 'outlook'}.com"
+        reg_date = _date_str(self._id_days_ago[i])
         return worker_id, name, email, reg_date, country, currency
 
-    def _generate_earnings(self, worker_id: str, cfg: ArchetypeConfig, n_months: int, currency: str, country: str) -> List[MonthlyEarning]:
+    def _generate_earnings(self, worker_id: str, cfg: ArchetypeConfig, n_months: int, currency: str, country: str) -> EarningsBlock:
         """Autoregressive earnings: each month = f(previous month) + noise.
         
         This gives month-to-month continuity instead of i.i.d. random draws.
@@ -311,99 +435,101 @@ class WorkerDatasetGenerator:
         momentum = 0.7  # how much previous month influences next (0=none, 1=full)
         fee_rate = self.rng.uniform(0.08, 0.15)  # fixed per worker (same contract)
 
-        records: List[MonthlyEarning] = []
-        ref = datetime(2026, 2, 1)
+        months = MONTH_STRINGS[n_months - 1::-1]  # oldest → newest
+        grosses: List[float] = []
         prev_gross = base  # seed with baseline
+        # Trend path base·trendⁱ for every month, computed once up front
+        targets = (base * np.power(trend, np.arange(n_months))).tolist()
+        # All of this worker's noise in one draw
+        noises = (self.rng.standard_normal(n_months) * vol).tolist()
 
         for i in range(n_months):
-            month_dt = ref - timedelta(days=30 * (n_months - 1 - i))
-            month_str = month_dt.strftime("%Y-%m")
-
             # Autoregressive: blend previous month with trend + noise
-            target = base * (trend ** i)
-            noise = self.rng.gauss(0, vol)
-            gross = momentum * prev_gross + (1 - momentum) * target + noise
-            gross = round(max(50.0, gross), 2)
-
-            fees = round(gross * fee_rate, 2)
-            net = round(gross - fees, 2)
-            prev_net = records[-1].net_earning if records else 0.0
-
-            records.append(MonthlyEarning(
-                worker_id=worker_id, month=month_str,
-                gross_earning=gross, platform_fees=fees,
-                net_earning=net, currency=currency,
-                prev_month_net=prev_net, country=country,
-            ))
+            gross = momentum * prev_gross + (1 - momentum) * targets[i] + noises[i]
+            gross = max(50.0, gross)
+            grosses.append(gross)
             prev_gross = gross  # carry forward
 
-        return records
+        # Round to cents once per column rather than per value inside the loop
+        gross_arr = np.round(np.array(grosses, dtype=np.float64), 2)
+        fees_arr = np.round(gross_arr * fee_rate, 2)
+        net_arr = np.round(gross_arr - fees_arr, 2)
+        prev_net = np.zeros_like(net_arr)
+        prev_net[1:] = net_arr[:-1]
+        return EarningsBlock(
+            worker_id=worker_id, currency=currency, country=country,
+            months=months,
+            gross=gross_arr, fees=fees_arr,
+            net=net_arr, prev_net=prev_net,
+        )
 
-    def _generate_expenses(self, worker_id: str, earnings: List[MonthlyEarning], cfg: ArchetypeConfig) -> List[MonthlyExpense]:
-        avg_net = statistics.mean(e.net_earning for e in earnings) if earnings else 1000.0
+    def _generate_expenses(self, worker_id: str, earnings: EarningsBlock, cfg: ArchetypeConfig) -> List[MonthlyExpense]:
+        avg_net = float(earnings.net.mean()) if len(earnings) else 1000.0
         expense_ratio = self.rng.uniform(*cfg.expense_ratio)
         total_budget = avg_net * expense_ratio
         rent_frac = self.rng.uniform(0.35, 0.50)
         food_frac = self.rng.uniform(0.20, 0.30)
         transport_frac = self.rng.uniform(0.08, 0.15)
         insurance_frac = 1.0 - rent_frac - food_frac - transport_frac
-        records: List[MonthlyExpense] = []
-        for e in earnings:
-            noise = self.rng.uniform(0.92, 1.08)
-            total = total_budget * noise
-            rent = round(total * rent_frac, 2)
-            food = round(total * food_frac, 2)
-            transport = round(total * transport_frac, 2)
-            insurance = round(total * insurance_frac, 2)
-            actual_total = round(rent + food + transport + insurance, 2)
-            records.append(MonthlyExpense(
-                worker_id=worker_id, month=e.month,
-                rent=rent, transport=transport, food=food,
-                insurance=insurance, total=actual_total,
-            ))
-        return records
+        # One noise draw per month, then each category as a whole column
+        totals = total_budget * self.rng.uniform(0.92, 1.08, len(earnings))
+        rent = np.round(totals * rent_frac, 2)
+        food = np.round(totals * food_frac, 2)
+        transport = np.round(totals * transport_frac, 2)
+        insurance = np.round(totals * insurance_frac, 2)
+        actual_total = np.round(rent + food + transport + insurance, 2)
+        return [
+            MonthlyExpense(
+                worker_id=worker_id, month=month,
+                rent=r, transport=tr, food=fd,
+                insurance=ins, total=tot,
+            )
+            for month, r, tr, fd, ins, tot in zip(
+                earnings.months, rent.tolist(), transport.tolist(),
+                food.tolist(), insurance.tolist(), actual_total.tolist(),
+            )
+        ]
 
     def _generate_repayments(self, worker_id: str, cfg: ArchetypeConfig, avg_net: float, n_months: int) -> List[AdvanceRepayment]:
-        n_repayments = self.rng.randint(*cfg.repayment_range)
+        n_repayments = self._randint(*cfg.repayment_range)
         on_time_prob = self.rng.uniform(*cfg.on_time_prob)
         records: List[AdvanceRepayment] = []
-        ref = datetime(2026, 2, 22)
         for i in range(n_repayments):
             self._advance_counter += 1
             adv_id = f"ADV-{self._advance_counter:06d}"
             amount = round(self.rng.uniform(0.15, 0.40) * avg_net, 2)
             days_back = int((n_repayments - i) / n_repayments * n_months * 30)
-            issued = ref - timedelta(days=days_back + self.rng.randint(0, 15))
-            due = issued + timedelta(days=30)
+            issued_back = days_back + self._randint(0, 15)
+            due_back = issued_back - 30
             roll = self.rng.random()
             if roll < cfg.default_prob:
-                status = RepaymentStatus.DEFAULTED
-                days_late = self.rng.randint(31, 90)
+                status = STATUS_DEFAULTED
+                days_late = self._randint(31, 90)
                 repaid_date = None
             elif roll < cfg.default_prob + (1 - on_time_prob):
-                status = RepaymentStatus.REPAID_LATE
-                days_late = self.rng.randint(1, 30)
-                repaid_date = (due + timedelta(days=days_late)).strftime("%Y-%m-%d")
+                status = STATUS_LATE
+                days_late = self._randint(1, 30)
+                repaid_date = _date_str(due_back - days_late)
             else:
-                status = RepaymentStatus.REPAID_ON_TIME
+                status = STATUS_ON_TIME
                 days_late = 0
-                early = self.rng.randint(0, 5)
-                repaid_date = (due - timedelta(days=early)).strftime("%Y-%m-%d")
+                early = self._randint(0, 5)
+                repaid_date = _date_str(due_back + early)
             records.append(AdvanceRepayment(
                 advance_id=adv_id, worker_id=worker_id,
-                amount=amount, date_issued=issued.strftime("%Y-%m-%d"),
-                date_due=due.strftime("%Y-%m-%d"), date_repaid=repaid_date,
-                status=status.value, days_late=days_late,
+                amount=amount, date_issued=_date_str(issued_back),
+                date_due=_date_str(due_back), date_repaid=repaid_date,
+                status=status, days_late=days_late,
             ))
         return records
 
     def _compute_risk_features(self, worker: WorkerProfile) -> None:
-        nets = [e.net_earning for e in worker.earnings]
-        worker.avg_wage = round(statistics.mean(nets), 2) if nets else 0.0
-        worker.income_volatility = round(statistics.stdev(nets), 2) if len(nets) > 1 else 0.0
+        nets = worker.earnings.net
+        worker.avg_wage = round(float(nets.mean()), 2) if nets.size else 0.0
+        worker.income_volatility = round(float(nets.std(ddof=1)), 2) if nets.size > 1 else 0.0
         delta = 50.0
-        if nets:
-            latest = nets[-1]
+        if nets.size:
+            latest = float(nets[-1])
             if latest > worker.avg_wage + delta:
                 worker.income_state = IncomeState.FEAST.value
             elif latest < worker.avg_wage - delta:
@@ -411,17 +537,17 @@ class WorkerDatasetGenerator:
             else:
                 worker.income_state = IncomeState.NORMAL.value
         worker.repayment_count = len(worker.repayments)
-        on_time = sum(1 for r in worker.repayments if r.status == RepaymentStatus.REPAID_ON_TIME.value)
+        on_time = sum(1 for r in worker.repayments if r.status == STATUS_ON_TIME)
         worker.on_time_rate = round(on_time / worker.repayment_count, 4) if worker.repayment_count else 0.0
-        worker.default_count = sum(1 for r in worker.repayments if r.status == RepaymentStatus.DEFAULTED.value)
+        worker.default_count = sum(1 for r in worker.repayments if r.status == STATUS_DEFAULTED)
         late_days = [r.days_late for r in worker.repayments if r.days_late > 0]
-        worker.avg_days_late = round(statistics.mean(late_days), 2) if late_days else 0.0
-        outstanding = sum(r.amount for r in worker.repayments if r.status == RepaymentStatus.DEFAULTED.value)
+        worker.avg_days_late = round(_mean(late_days), 2) if late_days else 0.0
+        outstanding = sum(r.amount for r in worker.repayments if r.status == STATUS_DEFAULTED)
         worker.debt_to_income = round(outstanding / worker.avg_wage, 4) if worker.avg_wage > 0 else 0.0
-        avg_expense = statistics.mean(e.total for e in worker.expenses) if worker.expenses else 0.0
+        avg_expense = _mean([e.total for e in worker.expenses]) if worker.expenses else 0.0
         worker.disposable_income = round(worker.avg_wage - avg_expense, 2)
         reg = datetime.strptime(worker.registration_date, "%Y-%m-%d")
-        worker.months_active = max(1, (datetime(2026, 2, 22) - reg).days // 30)
+        worker.months_active = max(1, (REF_DATE - reg).days // 30)
 
     def _generate_fx_transactions(self, worker: WorkerProfile) -> List[FxTransaction]:
         """Generate cross-border FX transactions.
@@ -450,7 +576,7 @@ class WorkerDatasetGenerator:
         # How much they can afford to send per month (5–25% of disposable)
         send_frac = self.rng.uniform(0.05, 0.25)
         # Not every month — skip some randomly
-        months_active = [e.month for e in worker.earnings]
+        months_active = worker.earnings.months
         active_ratio = self.rng.uniform(0.40, 0.85)  # they send 40-85% of months
 
         for month_str in months_active:
@@ -458,17 +584,17 @@ class WorkerDatasetGenerator:
                 continue  # skip this month
 
             # 1–3 transactions per active month
-            n_tx = self.rng.choices([1, 2, 3], weights=[0.55, 0.30, 0.15])[0]
+            n_tx = int(self.rng.choice((1, 2, 3), p=(0.55, 0.30, 0.15)))
             for _ in range(n_tx):
                 self._fx_counter += 1
                 tx_id = f"FX-{self._fx_counter:06d}"
                 # Stripe payment intent ID
-                pi_hex = ''.join(self.rng.choices('0123456789abcdef', k=24))
+                pi_hex = self.rng.bytes(12).hex()
                 stripe_pi = f"pi_{pi_hex}"
 
                 # Transaction date: random day within the month
                 year, mo = int(month_str[:4]), int(month_str[5:7])
-                day = self.rng.randint(1, 28)
+                day = self._randint(1, 28)
                 tx_date = f"{year}-{mo:02d}-{day:02d}"
 
                 # Amount: fraction of disposable, with noise
@@ -512,10 +638,10 @@ class WorkerDatasetGenerator:
             for _ in range(count):
                 idx += 1
                 wid, name, email, reg, country, currency = self._make_identity(idx)
-                n_months = self.rng.randint(*arch_cfg.months_range)
+                n_months = self._randint(*arch_cfg.months_range)
                 earnings = self._generate_earnings(wid, arch_cfg, n_months, currency, country)
                 expenses = self._generate_expenses(wid, earnings, arch_cfg)
-                avg_net = statistics.mean(e.net_earning for e in earnings) if earnings else 1000.0
+                avg_net = float(earnings.net.mean()) if len(earnings) else 1000.0
                 repayments = self._generate_repayments(wid, arch_cfg, avg_net, n_months)
                 worker = WorkerProfile(
                     worker_id=wid, name=name, email=email,
@@ -536,6 +662,48 @@ class WorkerDatasetGenerator:
 
 # ── Export Functions ───────────────────────────────────────────────────
 
+# Export files are a few MB each; a 1 MiB buffer keeps write() syscalls rare
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# CSV outputs: key → filename, and key → header row (column order matches
+# the tuples written in `DatasetExporter._write_csvs`).
+CSV_FILES = {
+    "csv":        "workers_500.csv",
+    "earnings":   "earnings_detail.csv",
+    "repayments": "repayments_detail.csv",
+    "fx":         "fx_transactions.csv",
+    "expenses":   "expenses_detail.csv",
+}
+CSV_FIELDS = {
+    "csv": [
+        "worker_id", "name", "platform", "country", "currency",
+        "archetype", "months_active", "avg_wage", "income_volatility",
+        "income_state", "debt_to_income", "repayment_count", "on_time_rate",
+        "avg_days_late", "default_count", "disposable_income",
+    ],
+    "earnings": ["worker_id", "month", "gross_earning", "platform_fees", "net_earning", "currency", "prev_month_net", "country"],
+    "repayments": ["advance_id", "worker_id", "amount", "date_issued", "date_due", "date_repaid", "status", "days_late"],
+    "fx": [
+        "tx_id", "stripe_payment_intent", "worker_id", "date",
+        "amount_sent", "currency_sent", "amount_received", "currency_received",
+        "exchange_rate", "destination_country", "status",
+    ],
+    "expenses": ["worker_id", "month", "rent", "transport", "food", "insurance", "total"],
+}
+
+
+# Field names per record type for the JSON export. The records are flat, so
+# reading attributes directly replaces `asdict` and its recursive deepcopy.
+_EARNING_FIELDS = tuple(f.name for f in fields(MonthlyEarning))
+_EXPENSE_FIELDS = tuple(f.name for f in fields(MonthlyExpense))
+_REPAYMENT_FIELDS = tuple(f.name for f in fields(AdvanceRepayment))
+_FX_FIELDS = tuple(f.name for f in fields(FxTransaction))
+
+
+def _to_dict(record: Any, names: Tuple[str, ...]) -> Dict[str, Any]:
+    return {name: getattr(record, name) for name in names}
+
+
 class DatasetExporter:
     """Writes generated workers to JSON + CSV files."""
 
@@ -545,14 +713,12 @@ class DatasetExporter:
         os.makedirs(data_dir, exist_ok=True)
 
     def export_all(self) -> Dict[str, str]:
-        paths = {}
-        paths["json"]       = self._write_json()
-        paths["csv"]        = self._write_flat_csv()
-        paths["earnings"]   = self._write_earnings_csv()
-        paths["repayments"] = self._write_repayments_csv()
-        paths["fx"]         = self._write_fx_csv()
-        paths["expenses"]   = self._write_expenses_csv()
-        return paths
+        # JSON serialisation is I/O-heavy and independent of the CSVs, so it
+        # runs on a worker thread while the CSVs are written in one pass.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            json_future = pool.submit(self._write_json)
+            csv_paths = self._write_csvs()
+            return {"json": json_future.result(), **csv_paths}
 
     def _write_json(self) -> str:
         path = os.path.join(self.data_dir, "workers_500.json")
@@ -569,90 +735,52 @@ class DatasetExporter:
                 "debt_to_income": w.debt_to_income, "repayment_count": w.repayment_count,
                 "on_time_rate": w.on_time_rate, "avg_days_late": w.avg_days_late,
                 "default_count": w.default_count, "disposable_income": w.disposable_income,
-                "earnings": [asdict(e) for e in w.earnings],
-                "expenses": [asdict(e) for e in w.expenses],
-                "repayments": [asdict(r) for r in w.repayments],
-                "fx_transactions": [asdict(t) for t in w.fx_transactions],
+                "earnings": [dict(zip(_EARNING_FIELDS, row)) for row in w.earnings.rows()],
+                "expenses": [_to_dict(e, _EXPENSE_FIELDS) for e in w.expenses],
+                "repayments": [_to_dict(r, _REPAYMENT_FIELDS) for r in w.repayments],
+                "fx_transactions": [_to_dict(t, _FX_FIELDS) for t in w.fx_transactions],
             }
             data.append(d)
-        with open(path, "w") as f:
+        with open(path, "w", buffering=EXPORT_BUFFER_SIZE) as f:
             json.dump({"workers": data, "generated_at": "2026-02-22", "count": len(data)}, f, indent=2)
         return path
 
-    def _write_flat_csv(self) -> str:
-        path = os.path.join(self.data_dir, "workers_500.csv")
-        fields = [
-            "worker_id", "name", "platform", "country", "currency",
-            "archetype", "months_active", "avg_wage", "income_volatility",
-            "income_state", "debt_to_income", "repayment_count", "on_time_rate",
-            "avg_days_late", "default_count", "disposable_income",
-        ]
-        with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writeheader()
-            for w in self.workers:
-                writer.writerow({
-                    "worker_id": w.worker_id, "name": w.name,
-                    "platform": w.platform,
-                    "country": w.country,
-                    "currency": w.currency,
-                    "archetype": w.archetype, "months_active": w.months_active,
-                    "avg_wage": w.avg_wage, "income_volatility": w.income_volatility,
-                    "income_state": w.income_state, "debt_to_income": w.debt_to_income,
-                    "repayment_count": w.repayment_count, "on_time_rate": w.on_time_rate,
-                    "avg_days_late": w.avg_days_late, "default_count": w.default_count,
-                    "disposable_income": w.disposable_income,
-                })
-        return path
+    def _write_csvs(self) -> Dict[str, str]:
+        """Write every CSV table in a single traversal of the workers."""
+        paths = {key: os.path.join(self.data_dir, name) for key, name in CSV_FILES.items()}
+        with ExitStack() as stack:
+            writers = {}
+            for key, path in paths.items():
+                writer = csv.writer(stack.enter_context(open(path, "w", buffering=EXPORT_BUFFER_SIZE, newline="")))
+                writer.writerow(CSV_FIELDS[key])
+                writers[key] = writer
+            flat_w, earn_w, rep_w = writers["csv"], writers["earnings"], writers["repayments"]
+            fx_w, exp_w = writers["fx"], writers["expenses"]
 
-    def _write_earnings_csv(self) -> str:
-        path = os.path.join(self.data_dir, "earnings_detail.csv")
-        fields = ["worker_id", "month", "gross_earning", "platform_fees", "net_earning", "currency", "prev_month_net", "country"]
-        with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writeheader()
             for w in self.workers:
-                for e in w.earnings:
-                    writer.writerow(asdict(e))
-        return path
-
-    def _write_fx_csv(self) -> str:
-        """One row per FX transaction → fx_transactions.csv"""
-        path = os.path.join(self.data_dir, "fx_transactions.csv")
-        fields = [
-            "tx_id", "stripe_payment_intent", "worker_id", "date",
-            "amount_sent", "currency_sent", "amount_received", "currency_received",
-            "exchange_rate", "destination_country", "status",
-        ]
-        with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writeheader()
-            for w in self.workers:
-                for t in w.fx_transactions:
-                    writer.writerow(asdict(t))
-        return path
-
-    def _write_repayments_csv(self) -> str:
-        path = os.path.join(self.data_dir, "repayments_detail.csv")
-        fields = ["advance_id", "worker_id", "amount", "date_issued", "date_due", "date_repaid", "status", "days_late"]
-        with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writeheader()
-            for w in self.workers:
-                for r in w.repayments:
-                    writer.writerow(asdict(r))
-        return path
-
-    def _write_expenses_csv(self) -> str:
-        path = os.path.join(self.data_dir, "expenses_detail.csv")
-        fields = ["worker_id", "month", "rent", "transport", "food", "insurance", "total"]
-        with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writeheader()
-            for w in self.workers:
-                for e in w.expenses:
-                    writer.writerow(asdict(e))
-        return path
+                flat_w.writerow((
+                    w.worker_id, w.name, w.platform, w.country, w.currency,
+                    w.archetype, w.months_active, w.avg_wage, w.income_volatility,
+                    w.income_state, w.debt_to_income, w.repayment_count, w.on_time_rate,
+                    w.avg_days_late, w.default_count, w.disposable_income,
+                ))
+                earn_w.writerows(w.earnings.rows())
+                rep_w.writerows(
+                    (r.advance_id, r.worker_id, r.amount, r.date_issued,
+                     r.date_due, r.date_repaid, r.status, r.days_late)
+                    for r in w.repayments
+                )
+                fx_w.writerows(
+                    (t.tx_id, t.stripe_payment_intent, t.worker_id, t.date,
+                     t.amount_sent, t.currency_sent, t.amount_received, t.currency_received,
+                     t.exchange_rate, t.destination_country, t.status)
+                    for t in w.fx_transactions
+                )
+                exp_w.writerows(
+                    (e.worker_id, e.month, e.rent, e.transport, e.food, e.insurance, e.total)
+                    for e in w.expenses
+                )
+        return paths
 
 
 # ── Report ────────────────────────────────────────────────────────────
@@ -662,43 +790,53 @@ def print_report(workers: List[WorkerProfile]) -> None:
     print("  Synthetic Dataset — 500 Gig Workers (DE + TR)")
     print(f"  Platform: {PLATFORM}  |  Countries: Germany (EUR) & Turkey (TRY)")
     print("=" * 80)
-    # Country split
-    de_count = sum(1 for w in workers if w.country == "DE")
-    tr_count = sum(1 for w in workers if w.country == "TR")
+    # One pass collects per-worker columns; group stats are bincounts on them.
+    arch_ids: Dict[str, int] = {}  # archetype → index, in first-seen order
+    arch_idx = np.empty(len(workers), dtype=np.intp)
+    wage = np.empty(len(workers))
+    on_time = np.empty(len(workers))
+    defaults = np.empty(len(workers), dtype=np.int64)
+    disposable = np.empty(len(workers))
+    n_fx = np.empty(len(workers), dtype=np.int64)
+    de_count = tr_count = 0
+    states = {"FEAST": 0, "NORMAL": 0, "FAMINE": 0}
+    for i, w in enumerate(workers):
+        arch_idx[i] = arch_ids.setdefault(w.archetype, len(arch_ids))
+        wage[i] = w.avg_wage
+        on_time[i] = w.on_time_rate
+        defaults[i] = w.default_count
+        disposable[i] = w.disposable_income
+        n_fx[i] = len(w.fx_transactions)
+        de_count += w.country == "DE"
+        tr_count += w.country == "TR"
+        states[w.income_state] = states.get(w.income_state, 0) + 1
+
+    n_arch = len(arch_ids)
+    counts = np.bincount(arch_idx, minlength=n_arch)
+    avg_w = np.bincount(arch_idx, weights=wage, minlength=n_arch) / counts
+    avg_ot = np.bincount(arch_idx, weights=on_time, minlength=n_arch) / counts * 100
+    total_def = np.bincount(arch_idx, weights=defaults, minlength=n_arch).astype(np.int64)
+    avg_di = np.bincount(arch_idx, weights=disposable, minlength=n_arch) / counts
+    fx_senders = np.bincount(arch_idx, weights=n_fx > 0, minlength=n_arch).astype(np.int64)
+
     print(f"\n  Country Split:  DE={de_count}  TR={tr_count}")
-    archetypes: Dict[str, List[WorkerProfile]] = {}
-    for w in workers:
-        archetypes.setdefault(w.archetype, []).append(w)
     print(f"\n  {'Archetype':<18} {'Count':>5} {'Avg Wage':>10} {'On-Time%':>9} {'Dflts':>6} {'Disp.':>8}")
     print("  " + "─" * 60)
-    for arch_name, group in archetypes.items():
-        avg_w = statistics.mean(w.avg_wage for w in group)
-        avg_ot = statistics.mean(w.on_time_rate for w in group) * 100
-        total_def = sum(w.default_count for w in group)
-        avg_di = statistics.mean(w.disposable_income for w in group)
+    for arch_name, k in arch_ids.items():
         print(
-            f"  {arch_name:<18} {len(group):>5}"
-            f" {avg_w:>9,.2f} {avg_ot:>8.1f}%"
-            f" {total_def:>6}"
-            f" {avg_di:>7,.0f}"
+            f"  {arch_name:<18} {counts[k]:>5}"
+            f" {avg_w[k]:>9,.2f} {avg_ot[k]:>8.1f}%"
+            f" {total_def[k]:>6}"
+            f" {avg_di[k]:>7,.0f}"
         )
-    states = {"FEAST": 0, "NORMAL": 0, "FAMINE": 0}
-    for w in workers:
-        states[w.income_state] = states.get(w.income_state, 0) + 1
     print(f"\n  Income States:  FEAST={states['FEAST']}  NORMAL={states['NORMAL']}  FAMINE={states['FAMINE']}")
     total_repayments = sum(w.repayment_count for w in workers)
-    total_defaults = sum(w.default_count for w in workers)
-    print(f"  Total Repayments: {total_repayments:,}  |  Total Defaults: {total_defaults}")
+    print(f"  Total Repayments: {total_repayments:,}  |  Total Defaults: {int(defaults.sum())}")
     # FX stats
-    fx_workers = [w for w in workers if w.fx_transactions]
-    total_fx = sum(len(w.fx_transactions) for w in workers)
-    fx_by_arch: Dict[str, int] = {}
-    for w in fx_workers:
-        fx_by_arch[w.archetype] = fx_by_arch.get(w.archetype, 0) + 1
-    print(f"  FX Senders: {len(fx_workers)}/{len(workers)}  |  Total FX Transactions: {total_fx:,}")
-    for arch, cnt in fx_by_arch.items():
-        total_in_arch = sum(1 for w in workers if w.archetype == arch)
-        print(f"    {arch}: {cnt}/{total_in_arch} workers active")
+    print(f"  FX Senders: {int(fx_senders.sum())}/{len(workers)}  |  Total FX Transactions: {int(n_fx.sum()):,}")
+    for arch, k in arch_ids.items():
+        if fx_senders[k]:
+            print(f"    {arch}: {fx_senders[k]}/{counts[k]} workers active")
     print(f"  Total Workers: {len(workers)}\n")
 
 
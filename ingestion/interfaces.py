@@ -10,7 +10,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List, Protocol
 
-from .models import EarningRecord, IncomeSmoothing
+from .models import EarningBatch, EarningRecord, IncomeSmoothing
 
 
 class IDataSourceAdapter(ABC):
@@ -51,6 +51,19 @@ class IIncomeSmoothingService(ABC):
     ) -> IncomeSmoothing:
         ...
 
+    def compute_batch(
+        self,
+        batch: EarningBatch,
+        delta: float = 50.0,
+    ) -> IncomeSmoothing:
+        """
+        Same as `compute`, over a chronologically ordered `EarningBatch`.
+
+        Override to work on the columns directly; the default falls
+        back to the record list.
+        """
+        return self.compute(batch.records, delta=delta)
+
 
 class IRecordSink(Protocol):
     """
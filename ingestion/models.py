@@ -7,9 +7,11 @@ passing them through the pipeline.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict
+from typing import Dict, List
+
+import numpy as np
 
 
 # ── Enums ─────────────────────────────────────────────────────────────
@@ -30,13 +32,28 @@ class EarningSourceType(Enum):
 
 # ── Core Record ───────────────────────────────────────────────────────
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+
+
+def epoch_seconds(dt: datetime) -> float:
+    """Seconds since the Unix epoch; naive datetimes are taken as UTC.
+
+    Exact to the microsecond, so ordering matches comparing the datetimes.
+    """
+    return (dt - (_EPOCH if dt.tzinfo is None else _EPOCH_UTC)).total_seconds()
+
+
 @dataclass(frozen=True)
 class EarningRecord:
     """
     A single normalised earning event.
 
     Amounts are stored in **cents** (integer) to avoid floating-point drift.
-    Use `amount_eur` for the human-readable value.
+    `amount_eur` is the human-readable value, derived once at construction.
+
+    No `__slots__`: `slots=True` needs Python 3.10, and a hand-written
+    tuple would clash with the `field(...)` specifiers below.
     """
     worker_id:     str
     source:        EarningSourceType
@@ -46,11 +63,14 @@ class EarningRecord:
     platform_name: str
     raw_id:        str
     metadata:      Dict[str, str] = field(default_factory=dict)
+    # Amount in major currency units (e.g. EUR) — derived, not an init arg
+    amount_eur:    float = field(init=False, repr=False, compare=False)
+    # Unix time of `earned_at` (naive = UTC) — cheap float sort key
+    earned_at_ts:  float = field(init=False, repr=False, compare=False)
 
-    @property
-    def amount_eur(self) -> float:
-        """Amount in major currency units (e.g. EUR)."""
-        return self.amount_cents / 100.0
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "amount_eur", self.amount_cents / 100.0)
+        object.__setattr__(self, "earned_at_ts", epoch_seconds(self.earned_at))
 
     def __repr__(self) -> str:
         return (
@@ -60,6 +80,69 @@ class EarningRecord:
         )
 
 
+# ── Columnar Batch ───────────────────────────────────────────────────
+
+# EarningSourceType ↔ compact int8 code used in `EarningBatch.sources`
+SOURCE_CODES: Dict[EarningSourceType, int] = {s: i for i, s in enumerate(EarningSourceType)}
+
+
+def _utc_naive(dt: datetime) -> datetime:
+    """Naive UTC datetime (NumPy's datetime64 has no timezone)."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class EarningBatch:
+    """
+    Structure-of-arrays view of a list of `EarningRecord`s.
+
+    Row i of every column describes `records[i]`. Numeric work (sums,
+    ordering) runs on the arrays; `records` keeps the original objects
+    for consumers that need them.
+    """
+    records:      List[EarningRecord]
+    worker_ids:   List[str]
+    amount_cents: np.ndarray          # int64
+    earned_at:    np.ndarray          # datetime64[us], naive UTC
+    sources:      np.ndarray          # int8, see SOURCE_CODES
+
+    @classmethod
+    def from_records(cls, records: List[EarningRecord]) -> "EarningBatch":
+        worker_ids: List[str] = []
+        cents:      List[int] = []
+        times:      List[datetime] = []
+        sources:    List[int] = []
+        for r in records:
+            worker_ids.append(r.worker_id)
+            cents.append(r.amount_cents)
+            times.append(_utc_naive(r.earned_at))
+            sources.append(SOURCE_CODES[r.source])
+        return cls(
+            records=list(records),
+            worker_ids=worker_ids,
+            amount_cents=np.array(cents, dtype=np.int64),
+            earned_at=np.array(times, dtype="datetime64[us]"),
+            sources=np.array(sources, dtype=np.int8),
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def sort_by_time(self) -> "EarningBatch":
+        """Chronologically ordered copy (stable, like `list.sort`)."""
+        order = np.argsort(self.earned_at, kind="stable")
+        idx = order.tolist()
+        return EarningBatch(
+            records=[self.records[i] for i in idx],
+            worker_ids=[self.worker_ids[i] for i in idx],
+            amount_cents=self.amount_cents[order],
+            earned_at=self.earned_at[order],
+            sources=self.sources[order],
+        )
+
+
 # ── Income Smoothing Result ──────────────────────────────────────────
 
 @dataclass
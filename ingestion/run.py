@@ -13,15 +13,30 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
+import mmap
 import os
 import sys
-from collections import defaultdict
-from typing import Any, Dict, List
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
 
 from .adapters.open_banking import OpenBankingAdapter
 from .smoothing import IncomeSmoothingService
-from .pipeline import IngestionPipeline
+from .models import epoch_seconds
+
+try:                                    # optional: SIMD-accelerated parser
+    from orjson import loads as _json_loads
+    _JSON_ACCEPTS_BUFFER = True         # parses a memoryview in place
+except ImportError:                     # stdlib fallback (needs bytes/str)
+    from json import loads as _json_loads
+    _JSON_ACCEPTS_BUFFER = False
+
+try:                                    # optional: incremental (streaming) parser
+    import ijson
+except ImportError:
+    ijson = None
 
 
 # ── Paths ─────────────────────────────────────────────────────────────
@@ -32,6 +47,52 @@ DEFAULT_JSON = os.path.join(DATA_DIR, "payments.json")
 DEFAULT_CSV  = os.path.join(DATA_DIR, "payments.csv")
 
 
+# ── JSON Load ─────────────────────────────────────────────────────────
+
+# Inputs at least this large are memory-mapped instead of read into bytes
+MMAP_MIN_BYTES = 64 * 1024 * 1024
+
+
+def load_json(path: str) -> Any:
+    """
+    Parse a JSON file from raw bytes (no text-mode decode pass).
+
+    Large files are mmap'd and handed to orjson as a buffer, so the
+    kernel pages them in on demand and no second copy is made.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if _JSON_ACCEPTS_BUFFER and size >= MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return _json_loads(view)
+        return _json_loads(f.read())
+
+
+# Transactions parsed / written / grouped per step when streaming
+STREAM_CHUNK_SIZE = 10_000
+
+
+def iter_transactions(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the `transactions` array of a payments file one dict at a time.
+
+    With ijson installed the file is parsed incrementally, so memory
+    stays flat however large the input is; otherwise it is loaded whole.
+    """
+    if ijson is None:
+        yield from load_json(path).get("transactions", [])
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "transactions.item", use_float=True)
+
+
+def _chunked(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
 # ── CSV Export ────────────────────────────────────────────────────────
 
 CSV_FIELDS = [
@@ -45,85 +106,185 @@ CSV_FIELDS = [
     "amount_cents",
 ]
 
-
-def export_csv(transactions: List[Dict[str, Any]], path: str) -> str:
-    """Write transactions to a flat CSV file."""
+# Shared read-only stand-in for a missing nested object, so lookups like
+# `tx.get("transactionAmount") or _EMPTY` never allocate a fresh `{}`
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Expression producing each CSV column from `tx` (one transaction dict),
+# `amount` / `account` (its nested objects) and `amount_cents`
+_CSV_FIELD_EXPRS: Dict[str, str] = {
+    "transactionId":                     'tx.get("transactionId", "")',
+    "bookingDate":                       'tx.get("bookingDate", "")',
+    "creditorName":                      'tx.get("creditorName", "")',
+    "debtorAccount_iban":                'account.get("iban", "")',
+    "remittanceInformationUnstructured": 'tx.get("remittanceInformationUnstructured", "")',
+    "amount":                            'amount.get("amount", "0")',
+    "currency":                          'amount.get("currency", "")',
+    "amount_cents":                      "amount_cents",
+}
+
+
+def _build_row_serializer(fields: List[str]) -> Callable[[Dict[str, Any], int], Tuple[Any, ...]]:
+    """
+    Compile `(tx, amount_cents) -> row tuple` specialised for *fields*.
+
+    The generated body is one flat tuple literal, so writing a row costs
+    a single straight-line bytecode sequence with no per-field dispatch.
+    """
+    columns = ",\n        ".join(_CSV_FIELD_EXPRS[name] for name in fields)
+    src = (
+        "def _serialize_row(tx, amount_cents):\n"
+        "    amount  = tx.get('transactionAmount') or _EMPTY\n"
+        "    account = tx.get('debtorAccount') or _EMPTY\n"
+        f"    return (\n        {columns},\n    )\n"
+    )
+    namespace: Dict[str, Any] = {"_EMPTY": _EMPTY}
+    exec(compile(src, "<csv-row-serializer>", "exec"), namespace)
+    return namespace["_serialize_row"]
+
+
+_serialize_row = _build_row_serializer(CSV_FIELDS)
+
+
+def parse_amounts(transactions: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Parse every `transactionAmount.amount` into one float64 array.
+
+    NumPy converts the whole column of numeric strings in C; only if
+    that fails (malformed value) do we fall back to a per-row parse,
+    where unparseable amounts become 0.0.
+    """
+    raw = [(tx.get("transactionAmount") or _EMPTY).get("amount", "0") for tx in transactions]
+    try:
+        amounts = np.asarray(raw, dtype=np.float64)
+    except (ValueError, TypeError):
+        amounts = np.array([_to_float(a) for a in raw], dtype=np.float64)
+    return np.nan_to_num(amounts, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _to_cents(amounts: np.ndarray) -> List[int]:
+    """Round parsed amounts to integer cents (round-half-even, like round())."""
+    return np.rint(amounts * 100).astype(np.int64).tolist()
+
+
+def _to_float(raw: Any) -> float:
+    try:
+        return float(raw)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def export_csv(
+    transactions: List[Dict[str, Any]],
+    path: str,
+    amounts: Optional[np.ndarray] = None,
+) -> str:
+    """Write transactions to a flat CSV file.
+
+    Pass the result of `parse_amounts` as *amounts* to avoid re-parsing.
+    """
     os.makedirs(os.path.dirname(path), exist_ok=True)
+    if amounts is None:
+        amounts = parse_amounts(transactions)
+    cents = _to_cents(amounts)
 
     with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-        writer.writeheader()
-        for tx in transactions:
-            raw_amt = tx.get("transactionAmount", {}).get("amount", "0")
-            try:
-                amount = float(raw_amt)
-            except (ValueError, TypeError):
-                amount = 0.0
-
-            writer.writerow({
-                "transactionId":                    tx.get("transactionId", ""),
-                "bookingDate":                      tx.get("bookingDate", ""),
-                "creditorName":                     tx.get("creditorName", ""),
-                "debtorAccount_iban":               tx.get("debtorAccount", {}).get("iban", ""),
-                "remittanceInformationUnstructured": tx.get("remittanceInformationUnstructured", ""),
-                "amount":                           raw_amt,
-                "currency":                         tx.get("transactionAmount", {}).get("currency", ""),
-                "amount_cents":                     int(round(amount * 100)),
-            })
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(map(_serialize_row, transactions, cents))
 
     return path
 
 
+# ── Per-account running totals ───────────────────────────────────────
+
+class _AccountStats:
+    """Running smoothing inputs for one account, updated per credit."""
+    __slots__ = ("label", "count", "total_cents", "last_key", "last_cents")
+
+    def __init__(self, label: str, key: float, cents: int) -> None:
+        self.label       = label
+        self.count       = 1
+        self.total_cents = cents
+        self.last_key    = key
+        self.last_cents  = cents
+
+    def add(self, key: float, cents: int) -> None:
+        self.count       += 1
+        self.total_cents += cents
+        if key >= self.last_key:     # latest by date; on ties, later input
+            self.last_key   = key
+            self.last_cents = cents
+
+
 # ── Main ──────────────────────────────────────────────────────────────
 
-def run(json_path: str = DEFAULT_JSON, csv_path: str = DEFAULT_CSV) -> None:
+def run(
+    json_path: str = DEFAULT_JSON,
+    csv_path: str = DEFAULT_CSV,
+    delta: float = 50.0,
+) -> None:
     """Execute the full Component 1 pipeline."""
 
     print("=" * 64)
     print("  Component 1 — Data Ingestion & Normalization Pipeline")
     print("=" * 64)
 
-    # 1. Load JSON ─────────────────────────────────────────────────────
-    with open(json_path, "r") as f:
-        data = json.load(f)
-    transactions = data.get("transactions", [])
-    print(f"\n  ✅  Loaded {len(transactions)} transactions from {json_path}")
-
-    # 2. Export CSV ────────────────────────────────────────────────────
-    out = export_csv(transactions, csv_path)
-    print(f"  ✅  CSV exported to {out}")
-
-    # 3. Group by debtor account ───────────────────────────────────────
-    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for tx in transactions:
-        amt = float(tx.get("transactionAmount", {}).get("amount", "0"))
-        if amt <= 0:
-            continue
-        acct = tx.get("debtorAccount", {}).get("iban", "unknown")
-        grouped[acct].append(tx)
-
-    # 4. Per-account income smoothing ──────────────────────────────────
-    smoother = IncomeSmoothingService()
+    # 1–3. One streaming pass: CSV rows + per-account running totals ───
+    #      (no grouped transaction lists, EarningRecords or per-account sort)
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    stats: Dict[str, _AccountStats] = {}
+    date_keys: Dict[str, float] = {}            # booking date → sort key
+    n_transactions = 0
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for chunk in _chunked(iter_transactions(json_path), STREAM_CHUNK_SIZE):
+            amounts = parse_amounts(chunk)      # parsed once per chunk, in C
+            cents = _to_cents(amounts)
+            writer.writerows(map(_serialize_row, chunk, cents))
+            for i in np.flatnonzero(amounts > 0).tolist():   # credits only
+                tx = chunk[i]
+                acct = (tx.get("debtorAccount") or _EMPTY).get("iban", "unknown")
+                date_str = tx.get("bookingDateTime") or tx.get("bookingDate", "")
+                key = date_keys.get(date_str)
+                if key is None:
+                    key = date_keys[date_str] = epoch_seconds(
+                        OpenBankingAdapter.parse_date(date_str)
+                    )
+                st = stats.get(acct)
+                if st is None:
+                    label = tx.get("remittanceInformationUnstructured", "?")[:12]
+                    stats[acct] = _AccountStats(label, key, cents[i])
+                else:
+                    st.add(key, cents[i])
+            n_transactions += len(chunk)
+    print(f"\n  ✅  Loaded {n_transactions} transactions from {json_path}")
+    print(f"  ✅  CSV exported to {csv_path}")
+
+    # 4. Per-account income smoothing (one vectorised call) ────────────
+    accounts = list(stats.values())
+    results = IncomeSmoothingService().compute_from_totals(
+        list(stats),
+        np.array([a.total_cents for a in accounts], dtype=np.int64),
+        np.array([a.count for a in accounts], dtype=np.int64),
+        np.array([a.last_cents for a in accounts], dtype=np.int64),
+        delta=delta,
+    )
 
     header = f"  {'Account':<14} {'Label':<14} {'Txns':>5} {'Total (€)':>12} {'Avg Wage (€)':>14} {'State':<8}"
     print(f"\n{header}")
     print("  " + "─" * 70)
 
-    for acct, txs in grouped.items():
-        adapter  = OpenBankingAdapter(txs)
-        pipeline = IngestionPipeline(adapters=[adapter], smoothing=smoother)
-        result   = pipeline.ingest_worker(worker_id=acct)
-
-        label = txs[0].get("remittanceInformationUnstructured", "?")[:12]
-
+    for (acct, st), result in zip(stats.items(), results):
         print(
-            f"  {acct[:12]:<14} {label:<14} {result.records_count:>5}"
+            f"  {acct[:12]:<14} {st.label:<14} {result.records_count:>5}"
             f" {result.total_earned:>12,.2f}"
             f" {result.avg_wage:>14,.2f}"
             f"  {result.state.value:<8}"
         )
 
-    print(f"\n  ✅  Pipeline complete — {len(grouped)} accounts processed.\n")
+    print(f"\n  ✅  Pipeline complete — {len(stats)} accounts processed.\n")
 
 
 # ── CLI ───────────────────────────────────────────────────────────────
@@ -14,14 +14,80 @@ Classification with volatility tolerance δ (default €50):
 """
 from __future__ import annotations
 
-from typing import List
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 from .interfaces import IIncomeSmoothingService
-from .models import EarningRecord, IncomeSmoothing, IncomeState
+from .models import EarningBatch, EarningRecord, IncomeSmoothing, IncomeState
+
+
+# Indexed by (current > B + δ) − (current < B − δ) + 1
+_STATE_TABLE = (IncomeState.FAMINE, IncomeState.NORMAL, IncomeState.FEAST)
+
+# Above this many records the cents are reduced with NumPy instead of sum()
+NUMPY_MIN_RECORDS = 256
+
+
+def _total_cents(records: List[EarningRecord]) -> int:
+    """Σ amount_cents — vectorised for large record sets."""
+    n = len(records)
+    if n > NUMPY_MIN_RECORDS:
+        cents = np.fromiter((r.amount_cents for r in records), dtype=np.int64, count=n)
+        return int(cents.sum())
+    return sum(r.amount_cents for r in records)
+
+
+def _state_indices(
+    total_cents: np.ndarray,
+    counts: np.ndarray,
+    current_cents: np.ndarray,
+    delta: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorised core of `_classify` for many accounts at once.
+
+    Returns (total, baseline, current, state_idx) arrays; the float
+    arithmetic is element-for-element the scalar formula, so results
+    match `compute` exactly. Accounts with count 0 must be masked out.
+    """
+    total    = total_cents / 100.0
+    baseline = total / np.maximum(counts, 1)
+    current  = current_cents / 100.0
+    state_idx = (current > baseline + delta).astype(np.int8) - (current < baseline - delta) + 1
+    return total, baseline, current, state_idx
+
+
+def _smooth_batch(
+    cents: np.ndarray,
+    offsets: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-account reductions over a concatenated cents array, in one go.
+
+    Account i owns `cents[offsets[i]:offsets[i+1]]` (chronological).
+    Segment sums come from one cumulative sum, so empty segments are
+    fine. Returns (counts, total_cents, current_cents).
+    """
+    csum    = np.concatenate(([0], np.cumsum(cents, dtype=np.int64)))
+    counts  = np.diff(offsets)
+    totals  = csum[offsets[1:]] - csum[offsets[:-1]]
+    last    = np.maximum(offsets[1:] - 1, 0)
+    current = cents[last] if cents.size else np.zeros_like(counts)
+    current = np.where(counts > 0, current, 0)
+    return counts, totals, current
 
 
 class IncomeSmoothingService(IIncomeSmoothingService):
-    """Concrete implementation of income smoothing."""
+    """
+    Concrete implementation of income smoothing.
+
+    Stateless by design: a result depends only on the records passed in,
+    so instances are cheap to recreate per job.
+    Results are deliberately not memoised — any key that detects a change
+    in the cents must read every amount, which costs as much as the single
+    reduction it would save.
+    """
 
     def compute(
         self,
@@ -30,31 +96,118 @@ class IncomeSmoothingService(IIncomeSmoothingService):
     ) -> IncomeSmoothing:
         # ── Edge case: no records ─────────────────────────────────────
         if not records:
-            return IncomeSmoothing(
-                worker_id="unknown",
-                baseline=0.0,
-                current=0.0,
+            return self._empty(delta)
+
+        # ── Core calculation (single pass, integer cents) ─────────────
+        return self._classify(
+            worker_id=records[0].worker_id,
+            total_cents=_total_cents(records),
+            n=len(records),
+            current_cents=records[-1].amount_cents,
+            delta=delta,
+        )
+
+    def compute_batch(
+        self,
+        batch: EarningBatch,
+        delta: float = 50.0,
+    ) -> IncomeSmoothing:
+        """Columnar variant: reductions run on `batch.amount_cents`."""
+        if not len(batch):
+            return self._empty(delta)
+        cents = batch.amount_cents
+        return self._classify(
+            worker_id=batch.worker_ids[0],
+            total_cents=int(cents.sum()),
+            n=cents.size,
+            current_cents=int(cents[-1]),
+            delta=delta,
+        )
+
+    def compute_all(
+        self,
+        batches: Sequence[EarningBatch],
+        delta: float = 50.0,
+    ) -> List[IncomeSmoothing]:
+        """
+        `compute_batch` for many accounts, reduced in a single NumPy call.
+
+        Equivalent to `[self.compute_batch(b, delta) for b in batches]`
+        without a Python-level loop over the arithmetic.
+        """
+        if not batches:
+            return []
+        offsets = np.zeros(len(batches) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in batches], out=offsets[1:])
+        cents = np.concatenate([b.amount_cents for b in batches])
+        counts, totals, currents = _smooth_batch(cents, offsets)
+        worker_ids = [b.worker_ids[0] if len(b) else "unknown" for b in batches]
+        return self.compute_from_totals(worker_ids, totals, counts, currents, delta)
+
+    def compute_from_totals(
+        self,
+        worker_ids: Sequence[str],
+        total_cents: np.ndarray,
+        counts: np.ndarray,
+        current_cents: np.ndarray,
+        delta: float = 50.0,
+    ) -> List[IncomeSmoothing]:
+        """
+        Classify accounts from pre-reduced running totals.
+
+        For callers that already track Σ cents, N and the latest amount
+        per account (e.g. a streaming ingest) and never build records.
+        """
+        total, baseline, current, state_idx = _state_indices(
+            np.asarray(total_cents), np.asarray(counts), np.asarray(current_cents), delta,
+        )
+        results: List[IncomeSmoothing] = []
+        for wid, n, t, base, cur, k in zip(
+            worker_ids, np.asarray(counts).tolist(), total.tolist(),
+            baseline.tolist(), current.tolist(), state_idx.tolist(),
+        ):
+            if not n:
+                results.append(self._empty(delta))
+                continue
+            results.append(IncomeSmoothing(
+                worker_id=wid,
+                baseline=round(base, 2),
+                current=round(cur, 2),
                 delta=delta,
-                state=IncomeState.FAMINE,
-                records_count=0,
-                total_earned=0.0,
-            )
-
-        # ── Core calculation ──────────────────────────────────────────
-        worker_id = records[0].worker_id
-        amounts   = [r.amount_eur for r in records]
-        total     = sum(amounts)
-        n         = len(amounts)
-        baseline  = total / n          # B = (1/N) × Σ Eₜ
-        current   = amounts[-1]        # most recent earning
-
-        # ── Classification ────────────────────────────────────────────
-        if current > baseline + delta:
-            state = IncomeState.FEAST
-        elif current < baseline - delta:
-            state = IncomeState.FAMINE
-        else:
-            state = IncomeState.NORMAL
+                state=_STATE_TABLE[k],
+                records_count=n,
+                total_earned=round(t, 2),
+            ))
+        return results
+
+    # ── Helpers ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _empty(delta: float) -> IncomeSmoothing:
+        return IncomeSmoothing(
+            worker_id="unknown",
+            baseline=0.0,
+            current=0.0,
+            delta=delta,
+            state=IncomeState.FAMINE,
+            records_count=0,
+            total_earned=0.0,
+        )
+
+    @staticmethod
+    def _classify(
+        worker_id: str,
+        total_cents: int,
+        n: int,
+        current_cents: int,
+        delta: float,
+    ) -> IncomeSmoothing:
+        total    = total_cents / 100.0
+        baseline = total / n                  # B = (1/N) × Σ Eₜ
+        current  = current_cents / 100.0      # most recent earning
+
+        # ── Classification: -1/0/+1 offset into _STATE_TABLE ──────────
+        state = _STATE_TABLE[(current > baseline + delta) - (current < baseline - delta) + 1]
 
         return IncomeSmoothing(
             worker_id=worker_id,
@@ -0,0 +1,24 @@
+"""
+Optional Numba JIT.
+
+``njit`` compiles a function with Numba when it is installed and is a
+no-op decorator otherwise, so kernels written for it still import and run
+(as plain Python) without it. Callers that only want a kernel when it is
+really compiled check ``HAVE_NUMBA``.
+"""
+
+try:                                    # optional: JIT compilation
+    from numba import njit as _numba_njit
+except ImportError:
+    _numba_njit = None
+
+HAVE_NUMBA = _numba_njit is not None
+
+
+def njit(*args, **kwargs):
+    """``numba.njit`` if available, else identity (``@njit`` and ``@njit(...)``)."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
@@ -4,6 +4,7 @@ Handles environment variables and application settings
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -12,9 +13,10 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 LOG_DIR = PROJECT_ROOT / "logs"
 
-# Create directories if they don't exist
-DATA_DIR.mkdir(exist_ok=True)
-LOG_DIR.mkdir(exist_ok=True)
+# Create the data directory if it doesn't exist (stat first: it usually
+# does). LOG_DIR is created by logger.py when the first record is written.
+if not DATA_DIR.is_dir():
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class Settings:
@@ -42,9 +44,10 @@ class Settings:
     AUTO_SEED_DATA: bool = os.getenv("AUTO_SEED_DATA", "True").lower() == "true"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get application settings (built once, then cached)"""
+    return Settings()
 
 
-def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
+settings = get_settings()
@@ -4,137 +4,250 @@ Handles all SQLite operations for accounts, FX rates, journal entries,
 postings, obligations, settlement_batches, and payout_queue.
 """
 
+import atexit
 import sqlite3
-from typing import List, Dict, Any, Optional
-import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 
 from .config import get_settings
 
+try:                                    # optional: faster JSON for metadata
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
 DB_PATH = get_settings().DATABASE_PATH
 
+# One connection per thread, opened lazily and reused for every query
+_TLS = threading.local()
+_CONNECTIONS: List[sqlite3.Connection] = []
+_CONNECTIONS_LOCK = threading.Lock()
+
+# Prepared statements kept per connection, keyed by SQL text. Every query
+# goes through Connection.execute, so identical SQL is parsed only once.
+STATEMENT_CACHE_SIZE = 256
+
+# Applied to every new connection. journal_mode=WAL persists in the file;
+# the rest are per-connection settings.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA page_size=8192",           # only takes effect on a new, empty file
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",        # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",      # 256 MiB memory-mapped I/O
+    "PRAGMA busy_timeout=5000",
+)
+
 
 def _ensure_data_dir():
+    """Create the data directory; called once per new connection."""
     from .config import DATA_DIR
     DATA_DIR.mkdir(exist_ok=True)
 
 
+def get_connection() -> sqlite3.Connection:
+    """Return this thread's connection, opening it on first use.
+
+    Autocommit mode (isolation_level=None): each statement commits on its
+    own, as the old connection-per-call code did.
+    """
+    con = getattr(_TLS, "con", None)
+    if con is None:
+        _ensure_data_dir()
+        con = sqlite3.connect(
+            DB_PATH,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        con.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            con.execute(pragma)
+        _TLS.con = con
+        with _CONNECTIONS_LOCK:
+            _CONNECTIONS.append(con)
+    return con
+
+
+@atexit.register
+def close_connections() -> None:
+    """Close every connection opened by get_connection().
+
+    Each runs `PRAGMA optimize` first, as SQLite recommends before closing.
+    """
+    with _CONNECTIONS_LOCK:
+        while _CONNECTIONS:
+            con = _CONNECTIONS.pop()
+            try:
+                con.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            con.close()
+    _TLS.__dict__.pop("con", None)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run the enclosed queries as one transaction on this thread's connection.
+
+    Commits on exit, rolls back on exception. Nested blocks join the
+    outermost transaction.
+    """
+    con = get_connection()
+    if con.in_transaction:
+        yield con
+        return
+    con.execute("BEGIN")
+    try:
+        yield con
+    except BaseException:
+        con.rollback()
+        raise
+    con.commit()
+
+
 def execute_query(
     sql: str,
     params: tuple = (),
     one: bool = False,
     fetch: bool = True
 ) -> Optional[Any]:
-    """Execute a SQL query safely. Uses a new connection per call."""
-    _ensure_data_dir()
-    con = sqlite3.connect(DB_PATH)
-    con.row_factory = sqlite3.Row
-    cur = con.cursor()
-    try:
-        cur.execute(sql, params)
-        con.commit()
-        if fetch:
-            rows = cur.fetchall()
-            return (rows[0] if rows else None) if one else rows
-    finally:
-        con.close()
-    return None
+    """Execute a SQL query safely on the thread's shared connection.
+
+    With fetch=False, returns the cursor's lastrowid — the new row's id
+    after an INSERT.
+    """
+    cur = get_connection().execute(sql, params)
+    if fetch:
+        rows = cur.fetchall()
+        return (rows[0] if rows else None) if one else rows
+    return cur.lastrowid
+
+
+def query_tuples(sql: str, params: tuple = ()) -> Tuple[List[str], List[tuple]]:
+    """Run a SELECT and return (column names, rows as plain tuples).
+
+    Skips sqlite3.Row, for callers that build their own dicts or only
+    read a few columns.
+    """
+    cur = get_connection().cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    return [d[0] for d in cur.description], cur.fetchall()
+
+
+def fetch_dicts(sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    """Run a SELECT and return each row as a plain dict."""
+    columns, rows = query_tuples(sql, params)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def fetch_one_dict(sql: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+    """Run a SELECT and return its first row as a dict, or None."""
+    cur = get_connection().cursor()
+    cur.row_factory = None
+    row = cur.execute(sql, params).fetchone()
+    return dict(zip([d[0] for d in cur.description], row)) if row else None
+
+
+# Secondary indexes for the hot lookups (journal_entries.external_id is
+# already covered by its UNIQUE constraint)
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_postings_entry_id ON postings(entry_id)",
+    "CREATE INDEX IF NOT EXISTS ix_postings_account_id ON postings(account_id)",
+    "CREATE INDEX IF NOT EXISTS ix_je_created_at ON journal_entries(created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_obl_status ON obligations(status)",
+    "CREATE INDEX IF NOT EXISTS ix_payout_queue_status ON payout_queue(status)",
+)
+
+
+# PDF schema (all 7 tables)
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS accounts(
+    id TEXT PRIMARY KEY,
+    kind TEXT,
+    country TEXT,
+    currency TEXT,
+    balance_minor INTEGER,
+    min_buffer_minor INTEGER
+);
+CREATE TABLE IF NOT EXISTS fx_rates(
+    currency TEXT PRIMARY KEY,
+    usd_per_unit REAL
+);
+CREATE TABLE IF NOT EXISTS journal_entries(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at INTEGER,
+    type TEXT,
+    external_id TEXT UNIQUE,
+    metadata_json TEXT
+);
+CREATE TABLE IF NOT EXISTS postings(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entry_id INTEGER,
+    account_id TEXT,
+    direction TEXT,
+    amount_minor INTEGER
+);
+CREATE TABLE IF NOT EXISTS obligations(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at INTEGER,
+    from_pool TEXT,
+    to_pool TEXT,
+    amount_usd_cents INTEGER,
+    status TEXT,
+    settlement_batch_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS settlement_batches(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at INTEGER,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS payout_queue(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at INTEGER,
+    from_pool TEXT,
+    to_pool TEXT,
+    amount_minor INTEGER,
+    status TEXT
+);
+"""
+
+# Tables + indexes as one script in a single transaction (one commit)
+_INIT_SCRIPT = "BEGIN;\n" + _SCHEMA_SQL + "".join(f"{ddl};\n" for ddl in _INDEXES) + "COMMIT;\n"
 
 
 def init_db() -> None:
     """Initialize database with PDF schema (all 7 tables)."""
-    _ensure_data_dir()
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS accounts(
-            id TEXT PRIMARY KEY,
-            kind TEXT,
-            country TEXT,
-            currency TEXT,
-            balance_minor INTEGER,
-            min_buffer_minor INTEGER
-        )
-    """)
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS fx_rates(
-            currency TEXT PRIMARY KEY,
-            usd_per_unit REAL
-        )
-    """)
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS journal_entries(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at INTEGER,
-            type TEXT,
-            external_id TEXT UNIQUE,
-            metadata_json TEXT
-        )
-    """)
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS postings(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            entry_id INTEGER,
-            account_id TEXT,
-            direction TEXT,
-            amount_minor INTEGER
-        )
-    """)
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS obligations(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at INTEGER,
-            from_pool TEXT,
-            to_pool TEXT,
-            amount_usd_cents INTEGER,
-            status TEXT,
-            settlement_batch_id INTEGER
-        )
-    """)
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS settlement_batches(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at INTEGER,
-            notes TEXT
-        )
-    """)
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS payout_queue(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at INTEGER,
-            from_pool TEXT,
-            to_pool TEXT,
-            amount_minor INTEGER,
-            status TEXT
-        )
-    """)
+    get_connection().executescript(_INIT_SCRIPT)
     _migrate_obligations_add_settlement_batch_id()
+    # Give the planner statistics for the indexes above
+    execute_query("ANALYZE")
 
 
 def _migrate_obligations_add_settlement_batch_id() -> None:
     """Add settlement_batch_id to obligations if the table was created with an older schema."""
-    _ensure_data_dir()
-    con = sqlite3.connect(DB_PATH)
-    cur = con.cursor()
-    try:
-        cur.execute("PRAGMA table_info(obligations)")
-        columns = [row[1] for row in cur.fetchall()]
-        if "settlement_batch_id" not in columns:
-            cur.execute("ALTER TABLE obligations ADD COLUMN settlement_batch_id INTEGER")
-            con.commit()
-    finally:
-        con.close()
+    con = get_connection()
+    columns = [row[1] for row in con.execute("PRAGMA table_info(obligations)")]
+    if "settlement_batch_id" not in columns:
+        con.execute("ALTER TABLE obligations ADD COLUMN settlement_batch_id INTEGER")
 
 
 # ----- Accounts -----
 
 def fetch_account(account_id: str) -> Optional[Dict[str, Any]]:
     """Fetch an account by ID."""
-    result = execute_query("SELECT * FROM accounts WHERE id=?", (account_id,), one=True)
-    return dict(result) if result else None
+    return fetch_one_dict("SELECT * FROM accounts WHERE id=?", (account_id,))
 
 
 def fetch_all_accounts() -> List[Dict[str, Any]]:
     """Fetch all accounts."""
-    results = execute_query("SELECT * FROM accounts")
-    return [dict(r) for r in results]
+    return fetch_dicts("SELECT * FROM accounts")
 
 
 def update_account_balance(account_id: str, amount_delta: int) -> None:
@@ -146,28 +259,119 @@ def update_account_balance(account_id: str, amount_delta: int) -> None:
     )
 
 
+def bulk_update_balances(deltas: Dict[str, int]) -> None:
+    """Apply {account_id: amount_delta} balance changes in one executemany."""
+    get_connection().executemany(
+        "UPDATE accounts SET balance_minor = balance_minor + ? WHERE id = ?",
+        [(delta, account_id) for account_id, delta in deltas.items()],
+    )
+
+
 # ----- FX rates -----
 
+# How long a looked-up rate is reused before re-reading fx_rates. Every
+# writer of fx_rates calls invalidate_fx_cache once its transaction has
+# committed, so this only bounds how long another process's edits can go
+# unseen. Missing rates are never cached.
+FX_CACHE_TTL_SEC = 300.0
+
+# currency -> (monotonic expiry, usd_per_unit)
+_fx_cache: Dict[str, Tuple[float, float]] = {}
+
+
 def fetch_fx_rate(currency: str) -> Optional[float]:
-    """Fetch FX rate for a currency (usd_per_unit)."""
+    """Fetch FX rate for a currency (usd_per_unit), cached for FX_CACHE_TTL_SEC."""
+    now = time.monotonic()
+    hit = _fx_cache.get(currency)
+    if hit is not None and hit[0] > now:
+        return hit[1]
     result = execute_query(
         "SELECT usd_per_unit FROM fx_rates WHERE currency=?",
         (currency,),
         one=True
     )
-    return float(result["usd_per_unit"]) if result else None
+    if not result:
+        return None
+    rate = float(result["usd_per_unit"])
+    _fx_cache[currency] = (now + FX_CACHE_TTL_SEC, rate)
+    return rate
+
+
+def invalidate_fx_cache(currency: Optional[str] = None) -> None:
+    """Drop one cached FX rate, or all of them (call once fx_rates writes have committed)."""
+    if currency is None:
+        _fx_cache.clear()
+    else:
+        _fx_cache.pop(currency, None)
 
 
 # ----- Journal entries & postings (idempotency) -----
 
+def dumps_metadata(data: Dict[str, Any]) -> str:
+    """Serialize journal-entry metadata to compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
+def loads_metadata(metadata_json: str) -> Any:
+    """Parse a journal entry's metadata_json (raises ValueError if malformed)."""
+    if orjson is not None:
+        return orjson.loads(metadata_json)
+    return json.loads(metadata_json)
+
+
+# Committed journal entries by external_id: a bounded LRU in front of the
+# idempotency lookup, so client retries are answered without a SELECT
+EXTERNAL_ID_CACHE_SIZE = 65_536
+_external_id_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_external_id_cache_lock = threading.Lock()
+
+
+def _cache_external_id(external_id: str, entry: Dict[str, Any]) -> None:
+    with _external_id_cache_lock:
+        _external_id_cache[external_id] = entry
+        _external_id_cache.move_to_end(external_id)
+        if len(_external_id_cache) > EXTERNAL_ID_CACHE_SIZE:
+            _external_id_cache.popitem(last=False)
+
+
+def remember_journal_entry(entry: Dict[str, Any]) -> None:
+    """Add a journal entry row to the idempotency cache.
+
+    Call only once its transaction has committed, with its final
+    metadata_json; entries without an external_id are ignored.
+    """
+    external_id = entry.get("external_id")
+    if external_id:
+        _cache_external_id(external_id, entry)
+
+
+def cached_journal_entry_by_external_id(external_id: str) -> Optional[Dict[str, Any]]:
+    """Journal entry for external_id if it is in the LRU, else None (no query)."""
+    with _external_id_cache_lock:
+        entry = _external_id_cache.get(external_id)
+        if entry is not None:
+            _external_id_cache.move_to_end(external_id)
+        return entry
+
+
 def get_journal_entry_by_external_id(external_id: str) -> Optional[Dict[str, Any]]:
-    """Get journal entry by external_id (for idempotency)."""
-    result = execute_query(
+    """Get journal entry by external_id (for idempotency).
+
+    Served from the LRU when possible; the returned dict is shared, so
+    callers must not mutate it.
+    """
+    entry = cached_journal_entry_by_external_id(external_id)
+    if entry is not None:
+        return entry
+    entry = fetch_one_dict(
         "SELECT * FROM journal_entries WHERE external_id = ?",
         (external_id,),
-        one=True
     )
-    return dict(result) if result else None
+    if entry is not None:
+        _cache_external_id(external_id, entry)
+    return entry
 
 
 def insert_journal_entry(
@@ -177,14 +381,12 @@ def insert_journal_entry(
     metadata_json: Optional[str] = None
 ) -> int:
     """Insert a journal entry. Returns id. external_id must be unique for idempotency."""
-    execute_query(
+    return execute_query(
         """INSERT INTO journal_entries(created_at, type, external_id, metadata_json)
            VALUES(?, ?, ?, ?)""",
         (created_at, type_, external_id, metadata_json),
         fetch=False
     )
-    r = execute_query("SELECT last_insert_rowid() AS id", one=True)
-    return r["id"] if r else 0
 
 
 def update_journal_entry_metadata(entry_id: int, metadata_json: Optional[str]) -> None:
@@ -198,32 +400,101 @@ def update_journal_entry_metadata(entry_id: int, metadata_json: Optional[str]) -
 
 def insert_posting(entry_id: int, account_id: str, direction: str, amount_minor: int) -> int:
     """Insert a posting. direction is 'CREDIT' or 'DEBIT'. Returns id."""
-    execute_query(
+    return execute_query(
         """INSERT INTO postings(entry_id, account_id, direction, amount_minor)
            VALUES(?, ?, ?, ?)""",
         (entry_id, account_id, direction, amount_minor),
         fetch=False
     )
-    r = execute_query("SELECT last_insert_rowid() AS id", one=True)
-    return r["id"] if r else 0
+
+
+def bulk_insert_postings(rows: List[tuple]) -> None:
+    """Insert many (entry_id, account_id, direction, amount_minor) postings at once."""
+    get_connection().executemany(
+        """INSERT INTO postings(entry_id, account_id, direction, amount_minor)
+           VALUES(?, ?, ?, ?)""",
+        rows,
+    )
 
 
 def fetch_postings_for_entry(entry_id: int) -> List[Dict[str, Any]]:
-    """Fetch all postings for a journal entry."""
-    results = execute_query("SELECT * FROM postings WHERE entry_id = ? ORDER BY id", (entry_id,))
-    return [dict(r) for r in results]
+    """Fetch all postings for a journal entry.
 
+    For single-entry lookups only — list views get the postings of a whole
+    page in the same query as the entries (_fetch_entries_with_postings).
+    """
+    return fetch_dicts("SELECT * FROM postings WHERE entry_id = ? ORDER BY id", (entry_id,))
 
-def fetch_journal_entries_for_account(
-    account_id: str,
-    limit: int = 100,
-    offset: int = 0,
-    from_ts: Optional[int] = None,
-    to_ts: Optional[int] = None,
-    type_filter: Optional[str] = None,
+
+_POSTING_COLUMNS = ("id", "entry_id", "account_id", "direction", "amount_minor")
+_POSTING_SELECT = ", ".join(f"p.{c} AS p_{c}" for c in _POSTING_COLUMNS)
+
+
+def _query_entry_posting_rows(
+    where: str,
+    params: List[Any],
+    limit: int,
+    offset: int,
+    posting_account_id: Optional[str] = None,
+) -> Tuple[List[str], List[tuple]]:
+    """One page of journal entries LEFT JOINed to their postings, as tuples.
+
+    The page (LIMIT/OFFSET) is taken over entries, then joined to postings,
+    so each row is one entry + one posting (posting columns, prefixed
+    ``p_``, are NULL for an entry without postings). Rows come back grouped
+    by entry. With *posting_account_id* only that account's postings join.
+    """
+    posting_filter = ""
+    join_params: List[Any] = []
+    if posting_account_id is not None:
+        posting_filter = " AND p.account_id = ?"
+        join_params.append(posting_account_id)
+    sql = f"""
+        WITH page AS (
+            SELECT je.* FROM journal_entries je
+            WHERE {where}
+            ORDER BY je.created_at DESC, je.id
+            LIMIT ? OFFSET ?
+        )
+        SELECT page.*, {_POSTING_SELECT} FROM page
+        LEFT JOIN postings p ON p.entry_id = page.id{posting_filter}
+        ORDER BY page.created_at DESC, page.id, p.id
+    """
+    return query_tuples(sql, tuple(params) + (limit, offset) + tuple(join_params))
+
+
+def _fetch_entries_with_postings(
+    where: str,
+    params: List[Any],
+    limit: int,
+    offset: int,
+    posting_account_id: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    """Fetch journal entries that have at least one posting for this account. Returns entries with posting details for this account."""
-    conditions = ["p.account_id = ?"]
+    """One page of journal entries folded into `{**entry, "postings": [...]}` dicts."""
+    columns, rows = _query_entry_posting_rows(where, params, limit, offset, posting_account_id)
+    n_entry_cols = len(columns) - len(_POSTING_COLUMNS)
+    entry_cols = columns[:n_entry_cols]
+    id_idx = entry_cols.index("id")
+    entries: Dict[int, Dict[str, Any]] = {}
+    for r in rows:
+        e = entries.get(r[id_idx])
+        if e is None:
+            e = dict(zip(entry_cols, r[:n_entry_cols]))
+            e["postings"] = []
+            entries[r[id_idx]] = e
+        if r[n_entry_cols] is not None:       # p_id: LEFT JOIN found a posting
+            e["postings"].append(dict(zip(_POSTING_COLUMNS, r[n_entry_cols:])))
+    return list(entries.values())
+
+
+def _account_entries_filter(
+    account_id: str,
+    from_ts: Optional[int],
+    to_ts: Optional[int],
+    type_filter: Optional[str],
+) -> Tuple[str, List[Any]]:
+    """WHERE clause for entries with at least one posting on *account_id*."""
+    conditions = ["EXISTS (SELECT 1 FROM postings p WHERE p.entry_id = je.id AND p.account_id = ?)"]
     params: list = [account_id]
     if from_ts is not None:
         conditions.append("je.created_at >= ?")
@@ -234,46 +505,16 @@ def fetch_journal_entries_for_account(
     if type_filter:
         conditions.append("je.type = ?")
         params.append(type_filter)
-    where = " AND ".join(conditions)
-    # Get distinct entry ids for this account
-    sql = f"""
-        SELECT DISTINCT je.id FROM journal_entries je
-        INNER JOIN postings p ON p.entry_id = je.id
-        WHERE {where}
-        ORDER BY je.created_at DESC
-        LIMIT ? OFFSET ?
-    """
-    params.extend([limit, offset])
-    rows = execute_query(sql, tuple(params))
-    entry_ids = [r["id"] for r in rows] if rows else []
-    if not entry_ids:
-        return []
-    placeholders = ",".join("?" * len(entry_ids))
-    entries = execute_query(
-        f"SELECT * FROM journal_entries WHERE id IN ({placeholders}) ORDER BY created_at DESC",
-        tuple(entry_ids)
-    )
-    result = []
-    for ent in entries:
-        e = dict(ent)
-        postings_list = fetch_postings_for_entry(e["id"])
-        # Include the posting(s) for this account only (for amount/direction)
-        my_postings = [p for p in postings_list if p["account_id"] == account_id]
-        e["postings"] = my_postings
-        result.append(e)
-    result.sort(key=lambda x: x["created_at"] or 0, reverse=True)
-    return result
+    return " AND ".join(conditions), params
 
 
-def fetch_all_journal_entries(
-    limit: int = 200,
-    offset: int = 0,
-    from_ts: Optional[int] = None,
-    to_ts: Optional[int] = None,
-    type_filter: Optional[str] = None,
-    account_currency: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """Fetch journal entries for admin. Optional filter by account currency (via postings->accounts)."""
+def _admin_entries_filter(
+    from_ts: Optional[int],
+    to_ts: Optional[int],
+    type_filter: Optional[str],
+    account_currency: Optional[str],
+) -> Tuple[str, List[Any]]:
+    """WHERE clause for the admin journal view (currency via postings->accounts)."""
     conditions = ["1=1"]
     params: list = []
     if from_ts is not None:
@@ -288,29 +529,91 @@ def fetch_all_journal_entries(
     if account_currency:
         conditions.append("EXISTS (SELECT 1 FROM postings p2 JOIN accounts a ON a.id = p2.account_id WHERE p2.entry_id = je.id AND a.currency = ?)")
         params.append(account_currency)
-    where = " AND ".join(conditions)
-    sql = f"""
-        SELECT je.* FROM journal_entries je
-        WHERE {where}
-        ORDER BY je.created_at DESC
-        LIMIT ? OFFSET ?
+    return " AND ".join(conditions), params
+
+
+def fetch_journal_entries_for_account(
+    account_id: str,
+    limit: int = 100,
+    offset: int = 0,
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+    type_filter: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch journal entries that have at least one posting for this account. Returns entries with posting details for this account."""
+    where, params = _account_entries_filter(account_id, from_ts, to_ts, type_filter)
+    # Include the posting(s) for this account only (for amount/direction)
+    return _fetch_entries_with_postings(where, params, limit, offset, posting_account_id=account_id)
+
+
+def count_journal_entries_for_account(account_id: str) -> int:
+    """Number of journal entries with at least one posting on this account."""
+    r = execute_query(
+        "SELECT COUNT(DISTINCT entry_id) AS c FROM postings WHERE account_id = ?",
+        (account_id,),
+        one=True
+    )
+    return int(r["c"]) if r else 0
+
+
+def fetch_journal_entry_posting_rows(
+    account_id: str,
+    limit: int = 100,
+    offset: int = 0,
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+    type_filter: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Like fetch_journal_entries_for_account, but flat: one dict per entry × posting.
+
+    Posting fields are ``p_id``, ``p_account_id``, ``p_direction``, … and are
+    None for an entry without postings on this account.
     """
-    params.extend([limit, offset])
-    rows = execute_query(sql, tuple(params))
-    result = []
-    for r in rows:
-        e = dict(r)
-        e["postings"] = fetch_postings_for_entry(e["id"])
-        result.append(e)
-    return result
+    where, params = _account_entries_filter(account_id, from_ts, to_ts, type_filter)
+    columns, rows = _query_entry_posting_rows(where, params, limit, offset, posting_account_id=account_id)
+    return [dict(zip(columns, r)) for r in rows]
+
+
+def fetch_all_journal_entries(
+    limit: int = 200,
+    offset: int = 0,
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+    type_filter: Optional[str] = None,
+    account_currency: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch journal entries for admin. Optional filter by account currency (via postings->accounts)."""
+    where, params = _admin_entries_filter(from_ts, to_ts, type_filter, account_currency)
+    return _fetch_entries_with_postings(where, params, limit, offset)
+
+
+def fetch_all_journal_entry_posting_tuples(
+    limit: int = 200,
+    offset: int = 0,
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+    type_filter: Optional[str] = None,
+    account_currency: Optional[str] = None,
+) -> Tuple[List[str], List[tuple]]:
+    """Flat (entry × posting) variant of fetch_all_journal_entries, as (column names, tuples).
+
+    Posting columns are prefixed ``p_`` as in fetch_journal_entry_posting_rows;
+    no per-row dicts are built, so callers can convert rows one at a time.
+    """
+    where, params = _admin_entries_filter(from_ts, to_ts, type_filter, account_currency)
+    return _query_entry_posting_rows(where, params, limit, offset)
+
+
+_DAY_SEC = 86400
 
 
 def count_journal_entries_today() -> int:
-    """Count journal entries created today (UTC day)."""
-    import time
-    now = int(time.time())
-    day_sec = 86400
-    start_today = (now // day_sec) * day_sec
+    """Count journal entries created today (UTC day).
+
+    Only a lower bound on created_at, so SQLite answers it with a range
+    search on the covering index ix_je_created_at.
+    """
+    start_today = int(time.time()) // _DAY_SEC * _DAY_SEC
     r = execute_query(
         "SELECT COUNT(*) AS c FROM journal_entries WHERE created_at >= ?",
         (start_today,),
@@ -323,19 +626,46 @@ def count_journal_entries_today() -> int:
 
 def fetch_open_obligations() -> List[Dict[str, Any]]:
     """Fetch all OPEN obligations."""
-    results = execute_query(
+    return fetch_dicts(
         "SELECT * FROM obligations WHERE status = 'OPEN' ORDER BY id"
     )
-    return [dict(r) for r in results]
+
+
+def fetch_open_obligation_rows() -> List[sqlite3.Row]:
+    """OPEN obligations as lazy sqlite3.Row views (id, pools, amount only).
+
+    For netting, which indexes a few fields per row and never serializes
+    them; API responses should use fetch_open_obligations.
+    """
+    return execute_query(
+        """SELECT id, from_pool, to_pool, amount_usd_cents FROM obligations
+           WHERE status = 'OPEN' ORDER BY id"""
+    )
+
+
+# Bumped by every write to obligations, so readers can tell whether a result
+# derived from the OPEN set (e.g. net positions) is still current
+_obligations_version = 0
+_obligations_version_lock = threading.Lock()
+
+
+def _bump_obligations_version() -> None:
+    global _obligations_version
+    with _obligations_version_lock:
+        _obligations_version += 1
+
+
+def obligations_version() -> int:
+    """Counter that changes whenever this process writes to obligations."""
+    return _obligations_version
 
 
 def fetch_all_obligations(limit: int = 200) -> List[Dict[str, Any]]:
     """Fetch all obligations (for state)."""
-    results = execute_query(
+    return fetch_dicts(
         "SELECT * FROM obligations ORDER BY id DESC LIMIT ?",
         (limit,)
     )
-    return [dict(r) for r in results]
 
 
 def insert_obligation(
@@ -346,27 +676,45 @@ def insert_obligation(
     settlement_batch_id: Optional[int] = None
 ) -> int:
     """Insert a new obligation. Returns id."""
-    execute_query(
+    obligation_id = execute_query(
         """INSERT INTO obligations(created_at, from_pool, to_pool, amount_usd_cents, status, settlement_batch_id)
            VALUES(?, ?, ?, ?, 'OPEN', ?)""",
         (created_at, from_pool, to_pool, amount_usd_cents, settlement_batch_id),
         fetch=False
     )
-    r = execute_query("SELECT last_insert_rowid() AS id", one=True)
-    return r["id"] if r else 0
+    _bump_obligations_version()
+    return obligation_id
+
+
+def insert_obligations_bulk(rows: List[tuple]) -> List[int]:
+    """Insert many (created_at, from_pool, to_pool, amount_usd_cents) OPEN obligations.
+
+    Runs in one transaction; each INSERT reports its id via RETURNING, so
+    the ids come back in input order.
+    """
+    sql = """INSERT INTO obligations(created_at, from_pool, to_pool, amount_usd_cents, status)
+             VALUES(?, ?, ?, ?, 'OPEN') RETURNING id"""
+    with transaction() as con:
+        ids = [con.execute(sql, row).fetchone()[0] for row in rows]
+    _bump_obligations_version()
+    return ids
 
 
 def update_obligations_settled(obligation_ids: List[int], settlement_batch_id: int) -> None:
-    """Mark obligations as SETTLED and set settlement_batch_id."""
+    """Mark obligations as SETTLED and set settlement_batch_id.
+
+    The ids travel as one JSON array expanded by json_each, so the SQL text
+    (and its cached statement) is the same for any number of ids.
+    """
     if not obligation_ids:
         return
-    placeholders = ",".join("?" * len(obligation_ids))
     execute_query(
-        f"""UPDATE obligations SET status = 'SETTLED', settlement_batch_id = ?
-           WHERE id IN ({placeholders})""",
-        (settlement_batch_id,) + tuple(obligation_ids),
+        """UPDATE obligations SET status = 'SETTLED', settlement_batch_id = ?
+           WHERE id IN (SELECT value FROM json_each(?))""",
+        (settlement_batch_id, "[" + ",".join(str(int(i)) for i in obligation_ids) + "]"),
         fetch=False
     )
+    _bump_obligations_version()
 
 
 def fetch_obligations_gross_usd_cents_open() -> int:
@@ -382,13 +730,11 @@ def fetch_obligations_gross_usd_cents_open() -> int:
 
 def insert_settlement_batch(created_at: int, notes: Optional[str] = None) -> int:
     """Insert a settlement batch. Returns id."""
-    execute_query(
+    return execute_query(
         "INSERT INTO settlement_batches(created_at, notes) VALUES(?, ?)",
         (created_at, notes or ""),
         fetch=False
     )
-    r = execute_query("SELECT last_insert_rowid() AS id", one=True)
-    return r["id"] if r else 0
 
 
 # ----- Payout queue -----
@@ -401,14 +747,12 @@ def insert_payout_queue(
     status: str = "QUEUED"
 ) -> int:
     """Insert into payout_queue. Returns id."""
-    execute_query(
+    return execute_query(
         """INSERT INTO payout_queue(created_at, from_pool, to_pool, amount_minor, status)
            VALUES(?, ?, ?, ?, ?)""",
         (created_at, from_pool, to_pool, amount_minor, status),
         fetch=False
     )
-    r = execute_query("SELECT last_insert_rowid() AS id", one=True)
-    return r["id"] if r else 0
 
 
 def fetch_payout_queue_queued_count() -> int:
@@ -422,11 +766,10 @@ def fetch_payout_queue_queued_count() -> int:
 
 def fetch_payout_queue_queued(limit: int = 100) -> List[Dict[str, Any]]:
     """Fetch QUEUED payout_queue rows."""
-    results = execute_query(
+    return fetch_dicts(
         "SELECT * FROM payout_queue WHERE status = 'QUEUED' ORDER BY id LIMIT ?",
         (limit,)
     )
-    return [dict(r) for r in results]
 
 
 def update_payout_queue_status(queue_id: int, status: str) -> None:
@@ -440,95 +783,128 @@ def update_payout_queue_status(queue_id: int, status: str) -> None:
 
 # ----- Seed & reset -----
 
+_CLEAR_ORDER = (
+    "postings",
+    "journal_entries",
+    "obligations",
+    "settlement_batches",
+    "payout_queue",
+    "accounts",
+    "fx_rates",
+)
+
+
 def clear_all_data() -> None:
     """Clear all data (for init/reset). Order respects FKs conceptually (no FKs in SQLite)."""
-    execute_query("DELETE FROM postings", fetch=False)
-    execute_query("DELETE FROM journal_entries", fetch=False)
-    execute_query("DELETE FROM obligations", fetch=False)
-    execute_query("DELETE FROM settlement_batches", fetch=False)
-    execute_query("DELETE FROM payout_queue", fetch=False)
-    execute_query("DELETE FROM accounts", fetch=False)
-    execute_query("DELETE FROM fx_rates", fetch=False)
+    # Unqualified DELETEs (no WHERE, triggers or RETURNING) hit SQLite's
+    # truncate optimization: whole tables are dropped page-wise, not row by row
+    with transaction() as con:
+        for table in _CLEAR_ORDER:
+            con.execute(f"DELETE FROM {table}")
+    # Only effective once committed; callers wrapping this in a larger
+    # transaction must call _reset_caches again after their commit
+    _reset_caches()
+
+
+def _reset_caches() -> None:
+    """Forget every in-process cache of table contents (after a commit)."""
+    invalidate_fx_cache()
+    _bump_obligations_version()
+    with _external_id_cache_lock:
+        _external_id_cache.clear()
 
 
 def seed_sample_data() -> None:
     """Seed accounts, FX rates, and fake journal/obligations for demo history."""
-    clear_all_data()
-    # Accounts: id, kind, country, currency, balance_minor, min_buffer_minor
-    for row in [
-        ("POOL_UK_GBP", "POOL", "UK", "GBP", 5_000_00, 10_00),   # £50,000, buffer £100
-        ("POOL_BR_BRL", "POOL", "BR", "BRL", 10_000_00, 10_00),  # 100,000 BRL, buffer 100
-        ("POOL_EU_EUR", "POOL", "EU", "EUR", 8_000_00, 10_00),   # €80,000, buffer €100
-        ("WORKER_1", "WORKER", "UK", "GBP", 1_000_00, 0),        # Gig workers (balance in minor)
-        ("WORKER_2", "WORKER", "EU", "EUR", 500_00, 0),
-        ("WORKER_3", "WORKER", "BR", "BRL", 2_000_00, 0),
-    ]:
-        execute_query(
+    with transaction():
+        clear_all_data()
+        con = get_connection()
+        # Accounts: id, kind, country, currency, balance_minor, min_buffer_minor
+        con.executemany(
             "INSERT INTO accounts(id, kind, country, currency, balance_minor, min_buffer_minor) VALUES(?, ?, ?, ?, ?, ?)",
-            row,
-            fetch=False
+            [
+                ("POOL_UK_GBP", "POOL", "UK", "GBP", 5_000_00, 10_00),   # £50,000, buffer £100
+                ("POOL_BR_BRL", "POOL", "BR", "BRL", 10_000_00, 10_00),  # 100,000 BRL, buffer 100
+                ("POOL_EU_EUR", "POOL", "EU", "EUR", 8_000_00, 10_00),   # €80,000, buffer €100
+                ("WORKER_1", "WORKER", "UK", "GBP", 1_000_00, 0),        # Gig workers (balance in minor)
+                ("WORKER_2", "WORKER", "EU", "EUR", 500_00, 0),
+                ("WORKER_3", "WORKER", "BR", "BRL", 2_000_00, 0),
+            ],
+        )
+        con.executemany(
+            "INSERT INTO fx_rates(currency, usd_per_unit) VALUES(?, ?)",
+            [("GBP", 1.25), ("BRL", 0.20), ("EUR", 1.10), ("USD", 1.0)],
         )
-    for row in [("GBP", 1.25), ("BRL", 0.20), ("EUR", 1.10), ("USD", 1.0)]:
-        execute_query("INSERT INTO fx_rates(currency, usd_per_unit) VALUES(?, ?)", row, fetch=False)
-    seed_fake_journal_and_obligations()
+        seed_fake_journal_and_obligations()
+    # After the commit: invalidating inside the transaction would let another
+    # connection re-cache the pre-seed snapshot in between
+    _reset_caches()
 
 
 def seed_fake_journal_and_obligations() -> None:
     """Insert fake journal entries, postings, and obligations so history is visible in the UI."""
-    import time
-    now = int(time.time())
-    day = 86400
-    # Timestamps over the last 5 days + recent (need 9 slots: indices 0..8)
-    t = [now - day * i for i in range(5, 0, -1)] + [now - 3600, now - 1800, now - 60, now]
-
-    # ---- TOPUPs (credit workers/pools) ----
-    e1 = insert_journal_entry(t[0], "TOPUP", None, '{"account_id":"WORKER_1","note":"Initial topup"}')
-    insert_posting(e1, "WORKER_1", "CREDIT", 5000)
-    update_account_balance("WORKER_1", 5000)
-
-    e2 = insert_journal_entry(t[1], "TOPUP", None, '{"account_id":"WORKER_2"}')
-    insert_posting(e2, "WORKER_2", "CREDIT", 3000)
-    update_account_balance("WORKER_2", 3000)
-
-    e3 = insert_journal_entry(t[2], "TOPUP", None, '{"account_id":"POOL_UK_GBP"}')
-    insert_posting(e3, "POOL_UK_GBP", "CREDIT", 10000)
-    update_account_balance("POOL_UK_GBP", 10000)
-
-    # ---- PAYOUTs (from_pool -> to_pool: DEBIT to_pool, obligation from_pool owes to_pool) ----
-    e4 = insert_journal_entry(t[3], "PAYOUT", None, '{"obligation_id":1,"amount_usd_cents":25000,"queued":false}')
-    insert_posting(e4, "WORKER_1", "DEBIT", 2000)
-    update_account_balance("WORKER_1", -2000)
-    insert_obligation("POOL_UK_GBP", "WORKER_1", 25000, t[3])
-
-    e5 = insert_journal_entry(t[4], "PAYOUT", None, '{"obligation_id":2,"amount_usd_cents":16500,"queued":false}')
-    insert_posting(e5, "WORKER_2", "DEBIT", 1500)
-    update_account_balance("WORKER_2", -1500)
-    insert_obligation("POOL_EU_EUR", "WORKER_2", 16500, t[4])
-
-    e6 = insert_journal_entry(t[5], "PAYOUT", None, '{"obligation_id":3,"amount_usd_cents":62500,"queued":false}')
-    insert_posting(e6, "POOL_BR_BRL", "DEBIT", 5000)
-    update_account_balance("POOL_BR_BRL", -5000)
-    insert_obligation("POOL_UK_GBP", "POOL_BR_BRL", 62500, t[5])
-
-    e7 = insert_journal_entry(t[6], "PAYOUT", None, '{"obligation_id":4,"amount_usd_cents":44000,"queued":false}')
-    insert_posting(e7, "POOL_UK_GBP", "DEBIT", 4000)
-    update_account_balance("POOL_UK_GBP", -4000)
-    insert_obligation("POOL_EU_EUR", "POOL_UK_GBP", 44000, t[6])
-
-    e8 = insert_journal_entry(t[7], "PAYOUT", None, '{"obligation_id":5,"amount_usd_cents":2000,"queued":false}')
-    insert_posting(e8, "WORKER_3", "DEBIT", 1000)
-    update_account_balance("WORKER_3", -1000)
-    insert_obligation("POOL_BR_BRL", "WORKER_3", 2000, t[7])
-
-    # ---- Queued payout (journal only, no balance change) ----
-    insert_payout_queue(t[7], "POOL_BR_BRL", "WORKER_3", 50000, "QUEUED")
-    insert_journal_entry(t[7], "QUEUED_PAYOUT", "fake-idem-1", '{"payout_queue_id":1,"queued":true}')
-
-    # ---- More TOPUPs so workers have visible history ----
-    e10 = insert_journal_entry(t[8], "TOPUP", None, '{"account_id":"WORKER_3"}')
-    insert_posting(e10, "WORKER_3", "CREDIT", 8000)
-    update_account_balance("WORKER_3", 8000)
-
-    e11 = insert_journal_entry(t[2], "TOPUP", None, '{"account_id":"WORKER_1"}')
-    insert_posting(e11, "WORKER_1", "CREDIT", 3000)
-    update_account_balance("WORKER_1", 3000)
+    with transaction():
+        now = int(time.time())
+        day = _DAY_SEC
+        # Timestamps over the last 5 days + recent (need 9 slots: indices 0..8)
+        t = [now - day * i for i in range(5, 0, -1)] + [now - 3600, now - 1800, now - 60, now]
+        # Postings, obligations and balance deltas are collected and written in bulk at the end
+        postings: List[tuple] = []
+        obligations: List[tuple] = []
+        deltas: Dict[str, int] = defaultdict(int)
+
+        # ---- TOPUPs (credit workers/pools) ----
+        e1 = insert_journal_entry(t[0], "TOPUP", None, dumps_metadata({"account_id": "WORKER_1", "note": "Initial topup"}))
+        postings.append((e1, "WORKER_1", "CREDIT", 5000))
+        deltas["WORKER_1"] += 5000
+
+        e2 = insert_journal_entry(t[1], "TOPUP", None, dumps_metadata({"account_id": "WORKER_2"}))
+        postings.append((e2, "WORKER_2", "CREDIT", 3000))
+        deltas["WORKER_2"] += 3000
+
+        e3 = insert_journal_entry(t[2], "TOPUP", None, dumps_metadata({"account_id": "POOL_UK_GBP"}))
+        postings.append((e3, "POOL_UK_GBP", "CREDIT", 10000))
+        deltas["POOL_UK_GBP"] += 10000
+
+        # ---- PAYOUTs (from_pool -> to_pool: DEBIT to_pool, obligation from_pool owes to_pool) ----
+        e4 = insert_journal_entry(t[3], "PAYOUT", None, dumps_metadata({"obligation_id": 1, "amount_usd_cents": 25000, "queued": False}))
+        postings.append((e4, "WORKER_1", "DEBIT", 2000))
+        deltas["WORKER_1"] -= 2000
+        obligations.append((t[3], "POOL_UK_GBP", "WORKER_1", 25000))
+
+        e5 = insert_journal_entry(t[4], "PAYOUT", None, dumps_metadata({"obligation_id": 2, "amount_usd_cents": 16500, "queued": False}))
+        postings.append((e5, "WORKER_2", "DEBIT", 1500))
+        deltas["WORKER_2"] -= 1500
+        obligations.append((t[4], "POOL_EU_EUR", "WORKER_2", 16500))
+
+        e6 = insert_journal_entry(t[5], "PAYOUT", None, dumps_metadata({"obligation_id": 3, "amount_usd_cents": 62500, "queued": False}))
+        postings.append((e6, "POOL_BR_BRL", "DEBIT", 5000))
+        deltas["POOL_BR_BRL"] -= 5000
+        obligations.append((t[5], "POOL_UK_GBP", "POOL_BR_BRL", 62500))
+
+        e7 = insert_journal_entry(t[6], "PAYOUT", None, dumps_metadata({"obligation_id": 4, "amount_usd_cents": 44000, "queued": False}))
+        postings.append((e7, "POOL_UK_GBP", "DEBIT", 4000))
+        deltas["POOL_UK_GBP"] -= 4000
+        obligations.append((t[6], "POOL_EU_EUR", "POOL_UK_GBP", 44000))
+
+        e8 = insert_journal_entry(t[7], "PAYOUT", None, dumps_metadata({"obligation_id": 5, "amount_usd_cents": 2000, "queued": False}))
+        postings.append((e8, "WORKER_3", "DEBIT", 1000))
+        deltas["WORKER_3"] -= 1000
+        obligations.append((t[7], "POOL_BR_BRL", "WORKER_3", 2000))
+
+        # ---- Queued payout (journal only, no balance change) ----
+        insert_payout_queue(t[7], "POOL_BR_BRL", "WORKER_3", 50000, "QUEUED")
+        insert_journal_entry(t[7], "QUEUED_PAYOUT", "fake-idem-1", dumps_metadata({"payout_queue_id": 1, "queued": True}))
+
+        # ---- More TOPUPs so workers have visible history ----
+        e10 = insert_journal_entry(t[8], "TOPUP", None, dumps_metadata({"account_id": "WORKER_3"}))
+        postings.append((e10, "WORKER_3", "CREDIT", 8000))
+        deltas["WORKER_3"] += 8000
+
+        e11 = insert_journal_entry(t[2], "TOPUP", None, dumps_metadata({"account_id": "WORKER_1"}))
+        postings.append((e11, "WORKER_1", "CREDIT", 3000))
+        deltas["WORKER_1"] += 3000
+
+        bulk_insert_postings(postings)
+        insert_obligations_bulk(obligations)
+        bulk_update_balances(deltas)
@@ -3,17 +3,27 @@ Engine layer – business logic for Synthetic Liquidity Ledger (PDF spec).
 Payout (idempotency, buffer, queue), settlement with threshold, topup via journal/postings, metrics.
 """
 
+import sqlite3
 import time
-import json
-from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
 
+try:                                    # optional: vectorised netting
+    import numpy as np
+except ImportError:
+    np = None
+
+from ._njit import HAVE_NUMBA, njit
 from .db import (
     fetch_account,
     fetch_all_accounts,
     fetch_fx_rate,
     fetch_open_obligations,
+    fetch_open_obligation_rows,
+    cached_journal_entry_by_external_id,
     get_journal_entry_by_external_id,
     insert_journal_entry,
     insert_posting,
@@ -22,13 +32,17 @@ from .db import (
     insert_payout_queue,
     update_account_balance,
     update_obligations_settled,
-    update_journal_entry_metadata,
-    fetch_obligations_gross_usd_cents_open,
+    obligations_version,
     fetch_payout_queue_queued_count,
     fetch_payout_queue_queued,
-    fetch_journal_entries_for_account,
-    fetch_all_journal_entries,
+    count_journal_entries_for_account,
+    fetch_journal_entry_posting_rows,
+    fetch_all_journal_entry_posting_tuples,
     count_journal_entries_today,
+    dumps_metadata,
+    loads_metadata,
+    remember_journal_entry,
+    transaction,
 )
 
 
@@ -41,6 +55,34 @@ def convert_to_usd_cents(amount_minor: int, currency: str) -> int:
     return int(round(usd * 100))
 
 
+def _duplicate_payout_response(existing: Dict[str, Any]) -> Dict:
+    """Response for a repeated external_id, rebuilt from the stored journal entry."""
+    meta = existing.get("metadata_json")
+    if meta:
+        try:
+            data = loads_metadata(meta)
+            return {
+                "ok": True,
+                "queued": data.get("queued", False),
+                "journal_entry_id": existing.get("id"),
+                "obligation_id": data.get("obligation_id"),
+                "amount_usd_cents": data.get("amount_usd_cents"),
+                "payout_queue_id": data.get("payout_queue_id"),
+                "message": "Duplicate request ignored (idempotent)",
+            }
+        except (ValueError, TypeError):
+            pass
+    return {
+        "ok": True,
+        "queued": False,
+        "journal_entry_id": existing.get("id"),
+        "obligation_id": None,
+        "amount_usd_cents": None,
+        "payout_queue_id": None,
+        "message": "Duplicate request ignored (idempotent)",
+    }
+
+
 def payout(
     from_pool: str,
     to_pool: str,
@@ -59,53 +101,67 @@ def payout(
     if not dest:
         raise HTTPException(status_code=404, detail=f"Destination account {to_pool} not found")
 
-    # Idempotency: if we already have a journal entry for this key, return stored response
+    # Idempotency fast path: a retry of a payout this process has already seen
     if external_id:
-        existing = get_journal_entry_by_external_id(external_id)
+        existing = cached_journal_entry_by_external_id(external_id)
         if existing:
-            meta = existing.get("metadata_json")
-            if meta:
-                try:
-                    data = json.loads(meta)
-                    return {
-                        "ok": True,
-                        "queued": data.get("queued", False),
-                        "journal_entry_id": existing.get("id"),
-                        "obligation_id": data.get("obligation_id"),
-                        "amount_usd_cents": data.get("amount_usd_cents"),
-                        "payout_queue_id": data.get("payout_queue_id"),
-                        "message": "Duplicate request ignored (idempotent)",
-                    }
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            return {
-                "ok": True,
-                "queued": False,
-                "journal_entry_id": existing.get("id"),
-                "obligation_id": None,
-                "amount_usd_cents": None,
-                "payout_queue_id": None,
-                "message": "Duplicate request ignored (idempotent)",
-            }
+            return _duplicate_payout_response(existing)
+
+    try:
+        amount_usd_cents = convert_to_usd_cents(amount_minor, source["currency"])
+    except HTTPException:
+        # Unpriceable now, but a retry of a committed payout still gets its
+        # idempotent answer rather than the FX error
+        existing = get_journal_entry_by_external_id(external_id) if external_id else None
+        if existing is None:
+            raise
+        return _duplicate_payout_response(existing)
+    # Otherwise insert first and let journal_entries.external_id's UNIQUE
+    # constraint detect the duplicate: no SELECT on the common path, and no
+    # window for two concurrent requests to both pay out
+    try:
+        return _execute_or_queue_payout(from_pool, to_pool, amount_minor, amount_usd_cents, dest, external_id)
+    except sqlite3.IntegrityError:
+        existing = get_journal_entry_by_external_id(external_id) if external_id else None
+        if existing is None:
+            raise
+        return _duplicate_payout_response(existing)
 
-    amount_usd_cents = convert_to_usd_cents(amount_minor, source["currency"])
+
+def _execute_or_queue_payout(
+    from_pool: str,
+    to_pool: str,
+    amount_minor: int,
+    amount_usd_cents: int,
+    dest: Dict[str, Any],
+    external_id: Optional[str],
+) -> Dict:
+    """Write a new payout (executed or queued); each branch is one transaction."""
     now = int(time.time())
 
     # Check liquidity: destination must have balance >= amount and stay above min_buffer
     dest_balance = dest["balance_minor"]
     dest_buffer = dest["min_buffer_minor"]
     if dest_balance >= amount_minor and (dest_balance - amount_minor) >= dest_buffer:
-        # Execute: journal entry + posting (DEBIT destination) + obligation
-        entry_id = insert_journal_entry(now, "PAYOUT", external_id, None)
-        insert_posting(entry_id, to_pool, "DEBIT", amount_minor)
-        update_account_balance(to_pool, -amount_minor)
-        obligation_id = insert_obligation(from_pool, to_pool, amount_usd_cents, now)
-        metadata = json.dumps({
-            "obligation_id": obligation_id,
-            "amount_usd_cents": amount_usd_cents,
-            "queued": False,
+        # Execute: obligation + journal entry + posting (DEBIT destination),
+        # committed together (one commit, and no half-written payout on error).
+        # The obligation goes first so the entry is inserted with its final
+        # metadata instead of being patched by a second UPDATE.
+        with transaction():
+            obligation_id = insert_obligation(from_pool, to_pool, amount_usd_cents, now)
+            metadata = dumps_metadata({
+                "obligation_id": obligation_id,
+                "amount_usd_cents": amount_usd_cents,
+                "queued": False,
+            })
+            entry_id = insert_journal_entry(now, "PAYOUT", external_id, metadata)
+            insert_posting(entry_id, to_pool, "DEBIT", amount_minor)
+            update_account_balance(to_pool, -amount_minor)
+        # Committed: later retries with this external_id skip the database
+        remember_journal_entry({
+            "id": entry_id, "created_at": now, "type": "PAYOUT",
+            "external_id": external_id, "metadata_json": metadata,
         })
-        update_journal_entry_metadata(entry_id, metadata)
         return {
             "ok": True,
             "queued": False,
@@ -117,13 +173,14 @@ def payout(
         }
     else:
         # Queue payout
-        queue_id = insert_payout_queue(now, from_pool, to_pool, amount_minor, "QUEUED")
-        entry_id = insert_journal_entry(
-            now,
-            "QUEUED_PAYOUT",
-            external_id,
-            json.dumps({"payout_queue_id": queue_id, "queued": True}),
-        )
+        with transaction():
+            queue_id = insert_payout_queue(now, from_pool, to_pool, amount_minor, "QUEUED")
+            metadata = dumps_metadata({"payout_queue_id": queue_id, "queued": True})
+            entry_id = insert_journal_entry(now, "QUEUED_PAYOUT", external_id, metadata)
+        remember_journal_entry({
+            "id": entry_id, "created_at": now, "type": "QUEUED_PAYOUT",
+            "external_id": external_id, "metadata_json": metadata,
+        })
         return {
             "ok": True,
             "queued": True,
@@ -135,38 +192,142 @@ def payout(
         }
 
 
+# Above this many open obligations, netting runs in NumPy (when installed)
+NUMPY_MIN_OBLIGATIONS = 256
+
+# The compiled netting loop keeps one slot per (pool, pool) code pair; past
+# this many slots the np.unique group-by is used instead
+NUMBA_MAX_PAIR_SLOTS = 1 << 20
+
+
 def _compute_net_positions(
-    obligations: List[Dict],
+    obligations: Sequence[Any],
 ) -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, str], List[int]]]:
     """
     Compute net position per (sorted) pair and which obligation ids belong to each pair.
+    Obligations may be dicts or sqlite3.Row objects (indexed by column name).
     Returns (net_positions, obligation_ids_per_pair).
     """
-    net_positions: Dict[Tuple[str, str], int] = {}
-    obligation_ids_per_pair: Dict[Tuple[str, str], List[int]] = {}
+    if np is not None and len(obligations) > NUMPY_MIN_OBLIGATIONS:
+        return _compute_net_positions_numpy(obligations)
+    net_positions: Dict[Tuple[str, str], int] = defaultdict(int)
+    obligation_ids_per_pair: Dict[Tuple[str, str], List[int]] = defaultdict(list)
     for ob in obligations:
         from_pool = ob["from_pool"]
         to_pool = ob["to_pool"]
         amount = ob["amount_usd_cents"]
-        pair = tuple(sorted([from_pool, to_pool]))
-        if pair not in net_positions:
-            net_positions[pair] = 0
-            obligation_ids_per_pair[pair] = []
-        A, B = pair
-        if from_pool == A and to_pool == B:
-            net_positions[pair] += amount
+        # Positive when flowing A -> B of the ordered pair (A <= B)
+        if from_pool <= to_pool:
+            pair = (from_pool, to_pool)
         else:
-            net_positions[pair] -= amount
+            pair = (to_pool, from_pool)
+            amount = -amount
+        net_positions[pair] += amount
         obligation_ids_per_pair[pair].append(ob["id"])
+    return dict(net_positions), dict(obligation_ids_per_pair)
+
+
+def _compute_net_positions_numpy(
+    obligations: Sequence[Any],
+) -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, str], List[int]]]:
+    """
+    Vectorised `_compute_net_positions`: a signed group-by-sum over pool pairs.
+
+    Same result as the loop, including pair order (first appearance) and
+    obligation id order within each pair. The per-pair sums run in a
+    Numba-compiled loop when numba is installed.
+    """
+    n = len(obligations)
+    pools, codes = np.unique(
+        [ob["from_pool"] for ob in obligations] + [ob["to_pool"] for ob in obligations],
+        return_inverse=True,
+    )
+    codes = codes.reshape(-1)
+    frm, to = codes[:n], codes[n:]
+    amounts = np.fromiter((ob["amount_usd_cents"] for ob in obligations), dtype=np.int64, count=n)
+    ids = np.fromiter((ob["id"] for ob in obligations), dtype=np.int64, count=n)
+
+    # pair_idx numbers pairs by first appearance; pair_keys[k] = lo*P + hi
+    if HAVE_NUMBA and len(pools) ** 2 <= NUMBA_MAX_PAIR_SLOTS:
+        pair_idx, pair_keys, nets = _pair_nets_loop(frm, to, amounts, len(pools))
+    else:
+        pair_idx, pair_keys, nets = _pair_nets_vectorised(frm, to, amounts, len(pools))
+    # Obligation ids grouped by pair, input order kept within each group
+    grouped_ids = np.split(
+        ids[np.argsort(pair_idx, kind="stable")],
+        np.cumsum(np.bincount(pair_idx, minlength=len(pair_keys)))[:-1],
+    )
+
+    names = pools.tolist()
+    net_positions: Dict[Tuple[str, str], int] = {}
+    obligation_ids_per_pair: Dict[Tuple[str, str], List[int]] = {}
+    for k in range(len(pair_keys)):
+        a, b = divmod(int(pair_keys[k]), len(names))
+        pair = (names[a], names[b])
+        net_positions[pair] = int(nets[k])
+        obligation_ids_per_pair[pair] = grouped_ids[k].tolist()
     return net_positions, obligation_ids_per_pair
 
 
+def _pair_nets_vectorised(frm, to, amounts, n_pools):
+    """Signed per-pair sums with np.unique; see `_pair_nets_loop` for the contract."""
+    # Pool codes sort like the names, so (lo, hi) is the sorted pair
+    lo = np.minimum(frm, to)
+    hi = np.maximum(frm, to)
+    signed = np.where(frm == lo, amounts, -amounts)
+    pair_keys, first_seen, pair_idx = np.unique(
+        lo * n_pools + hi, return_index=True, return_inverse=True,
+    )
+    nets = np.zeros(len(pair_keys), dtype=np.int64)
+    np.add.at(nets, pair_idx.reshape(-1), signed)
+    # Renumber pairs by first appearance, as the loop does
+    order = np.argsort(first_seen, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[pair_idx.reshape(-1)], pair_keys[order], nets[order]
+
+
+@njit(cache=True)
+def _pair_nets_loop(frm, to, amounts, n_pools):
+    """
+    One pass over obligations (pool codes *frm*/*to*, int64 *amounts*).
+
+    Returns (pair_idx, pair_keys, nets): each obligation's pair number
+    (pairs numbered by first appearance), each pair's key lo*n_pools + hi,
+    and its signed net (+ when paid from lo to hi).
+    """
+    n = frm.shape[0]
+    slot_of_key = np.full(n_pools * n_pools, -1, np.int64)
+    pair_idx = np.empty(n, np.int64)
+    pair_keys = np.empty(n, np.int64)
+    nets = np.zeros(n, np.int64)
+    m = 0
+    for i in range(n):
+        f = frm[i]
+        t = to[i]
+        if f <= t:
+            key = f * n_pools + t
+            amount = amounts[i]
+        else:
+            key = t * n_pools + f
+            amount = -amounts[i]
+        slot = slot_of_key[key]
+        if slot < 0:
+            slot = m
+            slot_of_key[key] = m
+            pair_keys[m] = key
+            m += 1
+        pair_idx[i] = slot
+        nets[slot] += amount
+    return pair_idx, pair_keys[:m], nets[:m]
+
+
 def settle_run(threshold_usd_cents: int) -> Dict:
     """
     Settle open obligations: net by pair, only settle pairs where abs(net) > threshold.
     Creates one settlement batch and marks those obligations as SETTLED.
     """
-    obligations = fetch_open_obligations()
+    obligations = fetch_open_obligation_rows()
     if not obligations:
         return {
             "ok": True,
@@ -200,8 +361,10 @@ def settle_run(threshold_usd_cents: int) -> Dict:
             "settlements": [],
             "message": f"No pairs above threshold {threshold_usd_cents}",
         }
-    batch_id = insert_settlement_batch(now, f"threshold={threshold_usd_cents}")
-    update_obligations_settled(all_obligation_ids_to_settle, batch_id)
+    with transaction():
+        batch_id = insert_settlement_batch(now, f"threshold={threshold_usd_cents}")
+        # One UPDATE for every obligation in the batch (ids bound as a JSON array)
+        update_obligations_settled(all_obligation_ids_to_settle, batch_id)
     return {
         "ok": True,
         "settlement_batch_id": batch_id,
@@ -217,9 +380,10 @@ def admin_topup(account_id: str, amount_minor: int) -> Dict:
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
     now = int(time.time())
-    entry_id = insert_journal_entry(now, "TOPUP", None, json.dumps({"account_id": account_id}))
-    insert_posting(entry_id, account_id, "CREDIT", amount_minor)
-    update_account_balance(account_id, amount_minor)
+    with transaction():
+        entry_id = insert_journal_entry(now, "TOPUP", None, dumps_metadata({"account_id": account_id}))
+        insert_posting(entry_id, account_id, "CREDIT", amount_minor)
+        update_account_balance(account_id, amount_minor)
     return {
         "ok": True,
         "account_id": account_id,
@@ -240,11 +404,36 @@ def get_state() -> Dict:
     }
 
 
+# Open-obligation snapshot shared by /metrics and /net_positions:
+# (obligations_version, expires_at, gross_usd_cents, net_positions)
+_open_nets_cache: Optional[Tuple[int, float, int, Dict[Tuple[str, str], int]]] = None
+
+# Upper bound on reuse, for writes this process's version counter can't see
+# (other processes, or a writer's transaction committing after the bump)
+OPEN_NETS_CACHE_TTL_SEC = 2.0
+
+
+def _open_obligation_nets() -> Tuple[int, Dict[Tuple[str, str], int]]:
+    """(gross USD cents, net positions) of OPEN obligations, cached per obligations version.
+
+    The returned dict is shared; callers must not mutate it.
+    """
+    global _open_nets_cache
+    version = obligations_version()       # read before the rows: a later write invalidates
+    now = time.monotonic()
+    cached = _open_nets_cache
+    if cached is not None and cached[0] == version and cached[1] > now:
+        return cached[2], cached[3]
+    obligations = fetch_open_obligation_rows()
+    gross = sum(ob["amount_usd_cents"] for ob in obligations)
+    net_positions, _ = _compute_net_positions(obligations)
+    _open_nets_cache = (version, now + OPEN_NETS_CACHE_TTL_SEC, gross, net_positions)
+    return gross, net_positions
+
+
 def get_metrics() -> Dict:
     """gross_usd_cents_open, net_usd_cents_if_settle_now, queued_count, transactions_today."""
-    gross = fetch_obligations_gross_usd_cents_open()
-    obligations = fetch_open_obligations()
-    net_positions, _ = _compute_net_positions(obligations)
+    gross, net_positions = _open_obligation_nets()
     net_usd_cents_if_settle_now = sum(abs(n) for n in net_positions.values())
     queued_count = fetch_payout_queue_queued_count()
     transactions_today = count_journal_entries_today()
@@ -283,60 +472,51 @@ def get_worker_transactions(
     account = fetch_account(worker_id)
     if not account or (account.get("kind") or "").strip().upper() != "WORKER":
         raise HTTPException(status_code=404, detail=f"Worker {worker_id} not found")
-    entries = fetch_journal_entries_for_account(
+    # One row per entry × posting (posting fields None when it has none)
+    rows = fetch_journal_entry_posting_rows(
         worker_id, limit=limit, offset=offset, from_ts=from_ts, to_ts=to_ts, type_filter=type_filter
     )
-    result = []
-    for e in entries:
-        postings = e.get("postings") or []
-        for p in postings:
-            result.append({
-                "id": e["id"],
-                "posting_id": p["id"],
-                "type": e["type"],
-                "amount_minor": p["amount_minor"],
-                "direction": p["direction"],
-                "currency": account["currency"],
-                "created_at": e["created_at"],
-                "metadata_json": e.get("metadata_json"),
-                "status": "completed",  # journal entries are completed
-            })
-        if not postings:
-            result.append({
-                "id": e["id"],
-                "posting_id": None,
-                "type": e["type"],
-                "amount_minor": 0,
-                "direction": None,
-                "currency": account["currency"],
-                "created_at": e["created_at"],
-                "metadata_json": e.get("metadata_json"),
-                "status": "completed",
-            })
-    return result
+    currency = account["currency"]
+    return [
+        {
+            "id": r["id"],
+            "posting_id": r["p_id"],
+            "type": r["type"],
+            "amount_minor": r["p_amount_minor"] if r["p_id"] is not None else 0,
+            "direction": r["p_direction"],
+            "currency": currency,
+            "created_at": r["created_at"],
+            "metadata_json": r["metadata_json"],
+            "status": "completed",  # journal entries are completed
+        }
+        for r in rows
+    ]
 
 
 def get_worker_summary(worker_id: str) -> Dict:
     """Worker summary: balance + transaction count."""
     balance_info = get_worker_balance(worker_id)
-    entries = fetch_journal_entries_for_account(worker_id, limit=1000)
-    count = len(entries)
     return {
         **balance_info,
-        "transaction_count": count,
+        "transaction_count": count_journal_entries_for_account(worker_id),
     }
 
 
-def get_admin_transactions(
+def iter_admin_transactions(
     limit: int = 200,
     offset: int = 0,
     from_ts: Optional[int] = None,
     to_ts: Optional[int] = None,
     type_filter: Optional[str] = None,
     account_currency: Optional[str] = None,
-) -> List[Dict]:
-    """All journal entries with postings for admin view. Flattened so each row is entry + one posting (for table)."""
-    entries = fetch_all_journal_entries(
+) -> Iterator[Dict]:
+    """All journal entries with postings for admin view. Flattened so each row is entry + one posting (for table).
+
+    The query runs immediately (so errors surface here) and returns plain
+    tuples; each row dict is built only as the iterator is consumed, e.g.
+    while streaming, so at most one exists at a time.
+    """
+    columns, rows = fetch_all_journal_entry_posting_tuples(
         limit=limit,
         offset=offset,
         from_ts=from_ts,
@@ -344,39 +524,49 @@ def get_admin_transactions(
         type_filter=type_filter,
         account_currency=account_currency,
     )
-    result = []
-    for e in entries:
-        for p in e.get("postings") or []:
-            result.append({
-                "id": e["id"],
-                "posting_id": p["id"],
-                "type": e["type"],
-                "account_id": p["account_id"],
-                "direction": p["direction"],
-                "amount_minor": p["amount_minor"],
-                "created_at": e["created_at"],
-                "metadata_json": e.get("metadata_json"),
-                "external_id": e.get("external_id"),
-            })
-        if not e.get("postings"):
-            result.append({
-                "id": e["id"],
-                "posting_id": None,
-                "type": e["type"],
-                "account_id": None,
-                "direction": None,
-                "amount_minor": 0,
-                "created_at": e["created_at"],
-                "metadata_json": e.get("metadata_json"),
-                "external_id": e.get("external_id"),
-            })
-    return result
+    return _admin_transaction_dicts(columns, rows)
+
+
+# Query columns behind each admin transaction row, in unpacking order
+_ADMIN_ROW_COLUMNS = (
+    "id", "p_id", "type", "p_account_id", "p_direction", "p_amount_minor",
+    "created_at", "metadata_json", "external_id",
+)
+
+
+def _admin_transaction_dicts(columns: List[str], rows: List[tuple]) -> Iterator[Dict]:
+    pick = itemgetter(*(columns.index(c) for c in _ADMIN_ROW_COLUMNS))
+    for row in rows:
+        (entry_id, posting_id, entry_type, account_id, direction, amount_minor,
+         created_at, metadata_json, external_id) = pick(row)
+        yield {
+            "id": entry_id,
+            "posting_id": posting_id,
+            "type": entry_type,
+            "account_id": account_id,
+            "direction": direction,
+            "amount_minor": amount_minor if posting_id is not None else 0,
+            "created_at": created_at,
+            "metadata_json": metadata_json,
+            "external_id": external_id,
+        }
+
+
+def get_admin_transactions(
+    limit: int = 200,
+    offset: int = 0,
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+    type_filter: Optional[str] = None,
+    account_currency: Optional[str] = None,
+) -> List[Dict]:
+    """`iter_admin_transactions` as a list."""
+    return list(iter_admin_transactions(limit, offset, from_ts, to_ts, type_filter, account_currency))
 
 
 def get_net_positions() -> List[Dict]:
     """Net positions per pool pair (from open obligations)."""
-    obligations = fetch_open_obligations()
-    net_positions, _ = _compute_net_positions(obligations)
+    _, net_positions = _open_obligation_nets()
     result = []
     for (pool_a, pool_b), net in net_positions.items():
         if net == 0:
@@ -387,5 +577,5 @@ def get_net_positions() -> List[Dict]:
             "net_usd_cents": net,
             "abs_usd_cents": abs(net),
         })
-    result.sort(key=lambda x: -abs(x["net_usd_cents"]))
+    result.sort(key=itemgetter("abs_usd_cents"), reverse=True)  # stable: ties keep pair order
     return result
@@ -14,16 +14,57 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import defaultdict
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, Iterator, List, Optional, Protocol
 
 from ..interfaces import IAlternativeDataRepository
 from ..models import EarningRecord, EarningSourceType
 
+try:                                    # optional: incremental (streaming) parser
+    import ijson
+except ImportError:
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
 
+# ---------------------------------------------------------------------------
+# Date helpers
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=4096)
+def _parse_booked(booked: str) -> datetime:
+    """
+    ``"YYYY-MM-DD"`` → UTC midnight, by slicing instead of ``strptime``.
+    Cached: transaction files repeat the same booked dates heavily.
+    """
+    if len(booked) != 10 or booked[4] != "-" or booked[7] != "-":
+        raise ValueError(f"booked date {booked!r} is not YYYY-MM-DD")
+    return datetime(
+        int(booked[0:4]), int(booked[5:7]), int(booked[8:10]), tzinfo=timezone.utc
+    )
+
+
+def _format_day(d: datetime) -> str:
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+# ---------------------------------------------------------------------------
+# Amount helpers
+# ---------------------------------------------------------------------------
+
+# 10**k for the scale offsets seen in practice
+_POW10 = tuple(10 ** k for k in range(19))
+
+
+def _pow10(k: int) -> int:
+    return _POW10[k] if k < len(_POW10) else 10 ** k
+
+
 # ---------------------------------------------------------------------------
 # Thin protocol for the data provider (file, API, etc.)
 # ---------------------------------------------------------------------------
@@ -56,17 +97,32 @@ class FileOpenBankingClient:
     """
     Reads Open Banking transactions from a local JSON file.
     Implements ``IOpenBankingClient``.
+
+    The file is read once, on first use, into an ``accountId`` index that
+    every later query reuses. That one pass streams with ``ijson`` when it
+    is installed, so the raw document is never held alongside the index.
     """
 
     def __init__(self, json_path: str | Path) -> None:
         self._path = Path(json_path)
-        self._data: Optional[Dict] = None
+        self._by_account: Optional[Dict[str, List[Dict[str, Any]]]] = None
 
-    def _load(self) -> Dict:
-        if self._data is None:
+    def _iter_transactions(self) -> Iterator[Dict[str, Any]]:
+        if ijson is None:
             with open(self._path) as f:
-                self._data = json.load(f)
-        return self._data
+                yield from json.load(f).get("transactions", [])
+            return
+        with open(self._path, "rb") as f:
+            yield from ijson.items(f, "transactions.item", use_float=True)
+
+    def _index(self) -> Dict[str, List[Dict[str, Any]]]:
+        """accountId -> its transactions in file order, built in one pass."""
+        if self._by_account is None:
+            by_account: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for t in self._iter_transactions():
+                by_account[t["accountId"]].append(t)
+            self._by_account = dict(by_account)
+        return self._by_account
 
     def list_transactions(
         self,
@@ -75,21 +131,19 @@ class FileOpenBankingClient:
         since: Optional[str] = None,
         until: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        data = self._load()
-        txns = [
-            t for t in data.get("transactions", [])
-            if t["accountId"] == account_id
+        transactions = self._index().get(account_id, [])
+        if not (since or until):
+            return list(transactions)
+        # The booked date is looked up once per record
+        return [
+            t for t in transactions
+            for booked in (t["dates"]["booked"],)
+            if (not since or booked >= since) and (not until or booked < until)
         ]
-        if since:
-            txns = [t for t in txns if t["dates"]["booked"] >= since]
-        if until:
-            txns = [t for t in txns if t["dates"]["booked"] < until]
-        return txns
 
     def list_all_account_ids(self) -> List[str]:
         """Return distinct account IDs found in the file."""
-        data = self._load()
-        return list({t["accountId"] for t in data.get("transactions", [])})
+        return list(self._index())
 
     def ping(self) -> bool:
         return self._path.exists()
@@ -126,8 +180,8 @@ class OpenBankingAdapter(IAlternativeDataRepository):
         since: Optional[datetime] = None,
         until: Optional[datetime] = None,
     ) -> List[EarningRecord]:
-        since_str = since.strftime("%Y-%m-%d") if since else None
-        until_str = until.strftime("%Y-%m-%d") if until else None
+        since_str = _format_day(since) if since else None
+        until_str = _format_day(until) if until else None
 
         raw = self._client.list_transactions(
             account_id=worker_id,
@@ -144,7 +198,7 @@ class OpenBankingAdapter(IAlternativeDataRepository):
                     "Skipping malformed OB txn %s", txn.get("id", "?"), exc_info=True
                 )
 
-        records.sort(key=lambda r: r.earned_at)
+        records.sort(key=attrgetter("earned_at"))
         logger.info(
             "Fetched %d earnings from Open Banking for account %s",
             len(records), worker_id,
@@ -173,13 +227,17 @@ class OpenBankingAdapter(IAlternativeDataRepository):
         minor_units (cents) = real_value * 100 = unscaledValue * 100 / 10^scale
                             = unscaledValue * 10^(2-scale)
         """
-        uv = int(unscaled)
-        s = int(scale)
+        uv = unscaled if type(unscaled) is int else int(unscaled)
+        s = scale if type(scale) is int else int(scale)
         if s <= 2:
-            return uv * (10 ** (2 - s))
-        else:
-            # scale > 2: divide, rounding to nearest cent
-            return round(uv / (10 ** (s - 2)))
+            return uv * _pow10(2 - s)
+        # scale > 2: divide, rounding to nearest cent (half to even, like
+        # round()) in exact integer arithmetic
+        p = _pow10(s - 2)
+        q, r = divmod(uv, p)
+        if 2 * r > p or (2 * r == p and q & 1):
+            q += 1
+        return q
 
     def _normalize(self, worker_id: str, txn: Dict[str, Any]) -> EarningRecord:
         amount_val = txn["amount"]["value"]
@@ -194,9 +252,7 @@ class OpenBankingAdapter(IAlternativeDataRepository):
             source_transaction_id=txn["id"],
             amount_minor=amount_minor,
             currency=txn["amount"]["currencyCode"].upper()[:3],
-            earned_at=datetime.strptime(booked, "%Y-%m-%d").replace(
-                tzinfo=timezone.utc
-            ),
+            earned_at=_parse_booked(booked),
             platform_name=txn["descriptions"].get("display", self._platform_name),
             metadata={
                 "original_description": txn["descriptions"].get("original"),
@@ -25,6 +25,9 @@ from ..models import EarningRecord, EarningSourceType
 
 logger = logging.getLogger(__name__)
 
+# Payout fields mapped onto EarningRecord columns; the rest go to metadata
+_PAYOUT_CORE_KEYS = frozenset(("id", "amount", "currency", "created"))
+
 
 # ---------------------------------------------------------------------------
 # Thin protocol describing what we need from a Stripe-like client
@@ -46,7 +49,11 @@ class IStripeClient(Protocol):
         created_lt: Optional[int] = None,
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
-        """Return a list of Stripe payout dicts for *account_id*."""
+        """Return a list of Stripe payout dicts for *account_id*, newest first.
+
+        Stripe lists objects in reverse-chronological order (``created``
+        descending); the adapter relies on that ordering.
+        """
         ...
 
     def ping(self) -> bool:
@@ -107,21 +114,14 @@ class StripeIngestionAdapter(IAlternativeDataRepository):
             created_lt=created_lt,
         )
 
-        records: List[EarningRecord] = []
-        for payout in raw_payouts:
-            try:
-                record = self._normalize(worker_id, payout)
-                records.append(record)
-            except Exception:
-                logger.warning(
-                    "Skipping malformed Stripe payout %s for worker %s",
-                    payout.get("id", "?"),
-                    worker_id,
-                    exc_info=True,
-                )
+        try:
+            records = self._normalize_all(worker_id, raw_payouts)
+        except Exception:
+            # Rare path: something is malformed, redo one by one to skip it
+            records = self._normalize_each(worker_id, raw_payouts)
 
-        # Chronological sort
-        records.sort(key=lambda r: r.earned_at)
+        # Client returns newest first (see IStripeClient.list_payouts)
+        records.reverse()
         logger.info(
             "Fetched %d earnings from Stripe for worker %s",
             len(records),
@@ -138,6 +138,23 @@ class StripeIngestionAdapter(IAlternativeDataRepository):
 
     # -- internal -----------------------------------------------------------
 
+    def _normalize_each(
+        self, worker_id: str, raw_payouts: List[Dict[str, Any]]
+    ) -> List[EarningRecord]:
+        """Normalise payouts one at a time, logging and skipping bad ones."""
+        records: List[EarningRecord] = []
+        for payout in raw_payouts:
+            try:
+                records.append(self._normalize(worker_id, payout))
+            except Exception:
+                logger.warning(
+                    "Skipping malformed Stripe payout %s for worker %s",
+                    payout.get("id", "?"),
+                    worker_id,
+                    exc_info=True,
+                )
+        return records
+
     def _normalize(
         self, worker_id: str, payout: Dict[str, Any]
     ) -> EarningRecord:
@@ -154,21 +171,28 @@ class StripeIngestionAdapter(IAlternativeDataRepository):
                 "metadata": { ... }
             }
         """
-        currency_raw: str = payout.get("currency", self._default_currency)
-
-        return EarningRecord(
-            worker_id=worker_id,
-            source=EarningSourceType.STRIPE_CONNECT,
-            source_transaction_id=payout["id"],
-            amount_minor=int(payout["amount"]),
-            currency=currency_raw.upper()[:3],
-            earned_at=datetime.fromtimestamp(
-                payout["created"], tz=timezone.utc
-            ),
-            platform_name=self._platform_name,
-            metadata={
-                k: v
-                for k, v in payout.items()
-                if k not in ("id", "amount", "currency", "created")
-            },
-        )
+        return self._normalize_all(worker_id, (payout,))[0]
+
+    def _normalize_all(
+        self, worker_id: str, raw_payouts: List[Dict[str, Any]]
+    ) -> List[EarningRecord]:
+        """``_normalize`` over all payouts in one comprehension; raises on any bad one."""
+        from_ts = datetime.fromtimestamp
+        utc = timezone.utc
+        source = EarningSourceType.STRIPE_CONNECT
+        platform_name = self._platform_name
+        default_currency = self._default_currency
+        core_keys = _PAYOUT_CORE_KEYS
+        return [
+            EarningRecord(
+                worker_id=worker_id,
+                source=source,
+                source_transaction_id=p["id"],
+                amount_minor=int(p["amount"]),
+                currency=p.get("currency", default_currency).upper()[:3],
+                earned_at=from_ts(p["created"], tz=utc),
+                platform_name=platform_name,
+                metadata={k: v for k, v in p.items() if k not in core_keys},
+            )
+            for p in raw_payouts
+        ]
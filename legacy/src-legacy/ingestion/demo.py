@@ -12,11 +12,12 @@ from __future__ import annotations
 
 import argparse
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from .adapters.stripe_adapter import StripeIngestionAdapter
 from .fake_stripe import FakeStripeClient
 from .income_smoothing import IncomeSmoothingService
+from .models import EarningRecord
 from .pipeline import IngestionPipeline
 
 
@@ -49,9 +50,9 @@ class DemoRunner:
             print(f"\n▸ Worker: {wid}")
             print(f"  Earnings fetched : {len(earnings)}")
             if earnings:
-                amounts = [e.amount_minor for e in earnings]
-                print(f"  Amount range     : {min(amounts)} – {max(amounts)} minor")
-                print(f"  Total            : {sum(amounts)} minor")
+                lo, hi, total = self._amount_stats(earnings)
+                print(f"  Amount range     : {lo} – {hi} minor")
+                print(f"  Total            : {total} minor")
             if smoothing:
                 print(f"  Baseline (B)     : {smoothing.baseline_minor} minor")
                 print(f"  Latest E_t       : {smoothing.latest_earning_minor} minor")
@@ -64,6 +65,20 @@ class DemoRunner:
         print("  via constructor injection to go live.")
         print("=" * 72)
 
+    @staticmethod
+    def _amount_stats(earnings: Sequence[EarningRecord]) -> Tuple[int, int, int]:
+        """(min, max, sum) of ``amount_minor`` in one pass over non-empty *earnings*."""
+        it = iter(earnings)
+        lo = hi = total = next(it).amount_minor
+        for e in it:
+            a = e.amount_minor
+            total += a
+            if a < lo:
+                lo = a
+            elif a > hi:
+                hi = a
+        return lo, hi, total
+
 
 class DemoPipelineFactory:
     """Builds a demo pipeline backed by FakeStripeClient."""
@@ -57,6 +57,7 @@ class FakeStripeClient:
 
         The generator produces ~30 payouts spread over the last 90 days
         for the given *account_id*, then filters by the requested window.
+        Newest first, like the real API.
         """
         payouts = self._generate_payouts(account_id, count=30, days_back=90)
 
@@ -109,6 +110,6 @@ class FakeStripeClient:
                 }
             )
 
-        # Sort chronologically
-        payouts.sort(key=lambda p: p["created"])
+        # Newest first, as Stripe lists them
+        payouts.sort(key=lambda p: p["created"], reverse=True)
         return payouts
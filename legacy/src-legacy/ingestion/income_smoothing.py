@@ -18,6 +18,24 @@ from typing import List
 from .interfaces import IIncomeSmoothingService
 from .models import EarningRecord, IncomeSmoothing, IncomeState
 
+try:                                    # optional: vectorised reduction
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Windows longer than this are summed with NumPy (when installed)
+NUMPY_MIN_WINDOW = 256
+
+
+def _total_minor(earnings: List[EarningRecord]) -> int:
+    """Σ amount_minor over the window — a C-level reduction for large windows."""
+    n = len(earnings)
+    if np is not None and n > NUMPY_MIN_WINDOW:
+        amounts = np.fromiter((e.amount_minor for e in earnings), dtype=np.int64, count=n)
+        return int(amounts.sum())
+    return sum(e.amount_minor for e in earnings)
+
 
 class IncomeSmoothingService(IIncomeSmoothingService):
     """
@@ -34,7 +52,7 @@ class IncomeSmoothingService(IIncomeSmoothingService):
             raise ValueError("earnings must be non-empty")
 
         n = len(earnings)
-        total = sum(e.amount_minor for e in earnings)
+        total = _total_minor(earnings)
         baseline = total // n  # integer division keeps us in minor units
 
         latest = earnings[-1].amount_minor  # chronologically last
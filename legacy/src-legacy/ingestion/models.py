@@ -6,11 +6,11 @@ Single Responsibility: each model captures one concept.
 
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
-
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
 
 
 # ---------------------------------------------------------------------------
@@ -41,69 +41,68 @@ class IncomeState(str, Enum):
 # Canonical earning record (internal representation)
 # ---------------------------------------------------------------------------
 
-class EarningRecord(BaseModel):
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+@dataclass(frozen=True)
+class EarningRecord:
     """
     Normalized earning event from *any* data source.
 
     This is the single internal contract that every adapter must produce.
     All monetary values are stored in **minor units** (cents / pence / …).
+
+    Adapters build many of these per worker, so it is a plain dataclass
+    checking only the two invariants the old schema enforced; adapters
+    skip records that raise ``ValueError`` here. (No ``__slots__``: the
+    field defaults would clash with them, and ``slots=True`` needs 3.10.)
     """
 
-    worker_id: str = Field(
-        ..., description="Platform-level unique identifier for the gig worker"
-    )
-    source: EarningSourceType = Field(
-        ..., description="Which provider supplied this record"
-    )
-    source_transaction_id: str = Field(
-        ..., description="Original transaction / payout ID from the provider"
-    )
-    amount_minor: int = Field(
-        ..., ge=0, description="Earned amount in minor units of the currency"
-    )
-    currency: str = Field(
-        ..., min_length=3, max_length=3, description="ISO 4217 currency code"
-    )
-    earned_at: datetime = Field(
-        ..., description="Timestamp when the earning was finalised"
-    )
-    platform_name: Optional[str] = Field(
-        None, description="Human-readable name of the gig platform (e.g. 'Uber')"
-    )
-    metadata: dict = Field(
-        default_factory=dict,
-        description="Extra provider-specific data preserved for auditing",
-    )
-    ingested_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Timestamp when the record entered our system",
-    )
+    worker_id: str                          # platform-level unique id of the gig worker
+    source: EarningSourceType               # which provider supplied this record
+    source_transaction_id: str              # original transaction / payout id from the provider
+    amount_minor: int                       # earned amount in minor units (≥ 0)
+    currency: str                           # ISO 4217 currency code
+    earned_at: datetime                     # when the earning was finalised
+    platform_name: Optional[str] = None     # human-readable gig platform (e.g. 'Uber')
+    metadata: Dict[str, Any] = field(default_factory=dict)  # provider extras, kept for auditing
+    ingested_at: int = field(default_factory=_now_ms)       # Unix epoch ms when it entered our system
 
-    class Config:
-        frozen = True  # immutable after creation — safe for pipelines
+    def __post_init__(self) -> None:
+        if self.amount_minor < 0:
+            raise ValueError(f"amount_minor must be >= 0, got {self.amount_minor}")
+        if len(self.currency) != 3:
+            raise ValueError(f"currency must be a 3-letter ISO 4217 code, got {self.currency!r}")
 
 
 # ---------------------------------------------------------------------------
 # Income Smoothing result (attached per-worker)
 # ---------------------------------------------------------------------------
 
-class IncomeSmoothing(BaseModel):
+@dataclass(frozen=True)
+class IncomeSmoothing:
     """
     Result of applying the baseline formula B = (1/N) * Σ E_t
     and classifying the latest earning against volatility tolerance δ.
+
+    Internal result (never parsed from input), so a plain frozen dataclass
+    rather than a validated model; the API shape is ``SmoothingOut``.
     """
 
-    worker_id: str
-    baseline_minor: int = Field(
-        ..., description="Computed baseline B in minor units"
-    )
-    latest_earning_minor: int = Field(
-        ..., description="Most recent E_t used for classification"
-    )
-    delta_minor: int = Field(
-        ..., description="Volatility tolerance δ in minor units"
+    # Spelled out rather than ``slots=True`` (3.10+); fine as no field has a default
+    __slots__ = (
+        "worker_id",
+        "baseline_minor",
+        "latest_earning_minor",
+        "delta_minor",
+        "state",
+        "window_size",
     )
+
+    worker_id: str
+    baseline_minor: int          # computed baseline B in minor units
+    latest_earning_minor: int    # most recent E_t used for classification
+    delta_minor: int             # volatility tolerance δ in minor units
     state: IncomeState
-    window_size: int = Field(
-        ..., ge=1, description="Number of periods N used in the baseline"
-    )
+    window_size: int             # number of periods N used in the baseline (≥ 1)
@@ -9,11 +9,20 @@ Class-based factory so that:
 
 from __future__ import annotations
 
+from functools import partial
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
+import anyio.to_thread
+from anyio import CapacityLimiter
+from fastapi import APIRouter, Depends, Query, Request
 
+try:                                    # optional: orjson-backed responses
+    import orjson  # noqa: F401  (ORJSONResponse needs it at render time)
+    from fastapi.responses import ORJSONResponse as _JSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as _JSONResponse
+
+from ..models import ResponseModel
 from .adapters.stripe_adapter import StripeIngestionAdapter
 from .fake_stripe import FakeStripeClient
 from .income_smoothing import IncomeSmoothingService
@@ -26,7 +35,7 @@ from .pipeline import IngestionPipeline
 # ---------------------------------------------------------------------------
 
 
-class EarningOut(BaseModel):
+class EarningOut(ResponseModel):
     """Serialisable earning record for API responses."""
     worker_id: str
     source: EarningSourceType
@@ -37,7 +46,7 @@ class EarningOut(BaseModel):
     platform_name: Optional[str] = None
 
 
-class SmoothingOut(BaseModel):
+class SmoothingOut(ResponseModel):
     """Serialisable income-smoothing result for API responses."""
     worker_id: str
     baseline_minor: int
@@ -47,7 +56,7 @@ class SmoothingOut(BaseModel):
     window_size: int
 
 
-class IngestResponse(BaseModel):
+class IngestResponse(ResponseModel):
     """Full pipeline response for a single worker."""
     worker_id: str
     total_earnings: int
@@ -56,7 +65,7 @@ class IngestResponse(BaseModel):
     earnings: List[EarningOut]
 
 
-class HealthOut(BaseModel):
+class HealthOut(ResponseModel):
     """Health-check response for all registered sources."""
     sources: Dict[str, bool]
 
@@ -65,6 +74,14 @@ class HealthOut(BaseModel):
 # Router Factory  (class-based, no module-level mutable state)
 # ---------------------------------------------------------------------------
 
+# ``app.state`` attribute holding the pipeline built by the app lifespan
+PIPELINE_STATE_ATTR = "ingestion_pipeline"
+
+
+def app_pipeline(request: Request) -> IngestionPipeline:
+    """Dependency: the pipeline the application created at startup."""
+    return getattr(request.app.state, PIPELINE_STATE_ATTR)
+
 
 class IngestionRouterFactory:
     """
@@ -72,20 +89,28 @@ class IngestionRouterFactory:
 
     Parameters
     ----------
-    pipeline : IngestionPipeline
-        Fully-configured pipeline instance (injected).
+    pipeline : IngestionPipeline, optional
+        Fully-configured pipeline instance (injected). When omitted, routes
+        resolve it per request from ``app.state.ingestion_pipeline``, which
+        the application sets in its lifespan.
     prefix : str
         URL prefix for the router (default ``"/ingestion"``).
+    max_threads : int
+        How many pipeline calls may run at once in worker threads.
+        The pipeline is synchronous (provider I/O), so routes offload it
+        rather than block the event loop.
     """
 
     def __init__(
         self,
-        pipeline: IngestionPipeline,
+        pipeline: Optional[IngestionPipeline] = None,
         *,
         prefix: str = "/ingestion",
+        max_threads: int = 64,
     ) -> None:
         self._pipeline = pipeline
         self._prefix = prefix
+        self._limiter = CapacityLimiter(max_threads)
 
     def build(self) -> APIRouter:
         """Create and return the configured ``APIRouter``."""
@@ -93,59 +118,73 @@ class IngestionRouterFactory:
         self._register_routes(rtr)
         return rtr
 
-    def _register_routes(self, rtr: APIRouter) -> None:
+    def _pipeline_dependency(self):
+        if self._pipeline is None:
+            return app_pipeline
         pipeline = self._pipeline
+        return lambda: pipeline
+
+    def _register_routes(self, rtr: APIRouter) -> None:
+        get_pipeline = self._pipeline_dependency()
+        limiter = self._limiter
 
         @rtr.get("/health", response_model=HealthOut)
-        async def ingestion_health():
+        async def ingestion_health(pipeline: IngestionPipeline = Depends(get_pipeline)):
             """Health-check all registered data sources."""
-            return HealthOut(sources=pipeline.health_check())
+            sources = await anyio.to_thread.run_sync(pipeline.health_check, limiter=limiter)
+            return HealthOut(sources=sources)
 
-        @rtr.get("/worker/{worker_id}", response_model=IngestResponse)
+        @rtr.get(
+            "/worker/{worker_id}",
+            response_model=IngestResponse,
+            response_class=_JSONResponse,
+        )
         async def ingest_worker(
             worker_id: str,
             source: Optional[str] = Query(None, description="Restrict to a named source"),
             delta: int = Query(2_000, description="Volatility tolerance δ in minor units"),
+            pipeline: IngestionPipeline = Depends(get_pipeline),
         ):
             """Run the ingestion + income-smoothing pipeline for a worker."""
-            result = pipeline.ingest_worker(worker_id, source=source, delta_override=delta)
-            return IngestionRouterFactory._to_response(worker_id, result)
-
-    @staticmethod
-    def _to_response(worker_id: str, result: dict) -> IngestResponse:
-        """Convert pipeline dict → API response model."""
-        earnings_out = [
-            EarningOut(
-                worker_id=e.worker_id,
-                source=e.source,
-                source_transaction_id=e.source_transaction_id,
-                amount_minor=e.amount_minor,
-                currency=e.currency,
-                earned_at=e.earned_at.isoformat(),
-                platform_name=e.platform_name,
-            )
-            for e in result["earnings"]
-        ]
-
-        smoothing_out = None
-        if result["smoothing"]:
-            s = result["smoothing"]
-            smoothing_out = SmoothingOut(
-                worker_id=s.worker_id,
-                baseline_minor=s.baseline_minor,
-                latest_earning_minor=s.latest_earning_minor,
-                delta_minor=s.delta_minor,
-                state=s.state,
-                window_size=s.window_size,
+            result = await anyio.to_thread.run_sync(
+                partial(pipeline.ingest_worker, worker_id, source=source, delta_override=delta),
+                limiter=limiter,
             )
+            # Plain dicts straight to the (orjson) encoder: one pass, no model
+            # instances and no FastAPI re-validation; response_model above
+            # still documents the shape in OpenAPI
+            return _JSONResponse(content=IngestionRouterFactory._to_response(worker_id, result))
 
-        return IngestResponse(
-            worker_id=worker_id,
-            total_earnings=len(earnings_out),
-            source_counts=result["source_counts"],
-            smoothing=smoothing_out,
-            earnings=earnings_out,
-        )
+    @staticmethod
+    def _to_response(worker_id: str, result: dict) -> dict:
+        """Convert pipeline dict → JSON-ready dict shaped like ``IngestResponse``."""
+        earnings = result["earnings"]
+        s = result["smoothing"]
+        return {
+            "worker_id": worker_id,
+            "total_earnings": len(earnings),
+            "source_counts": result["source_counts"],
+            "smoothing": None if not s else {
+                "worker_id": s.worker_id,
+                "baseline_minor": s.baseline_minor,
+                "latest_earning_minor": s.latest_earning_minor,
+                "delta_minor": s.delta_minor,
+                "state": s.state.value,
+                "window_size": s.window_size,
+            },
+            "earnings": [
+                {
+                    "worker_id": e.worker_id,
+                    "source": e.source.value,
+                    "source_transaction_id": e.source_transaction_id,
+                    "amount_minor": e.amount_minor,
+                    "currency": e.currency,
+                    "earned_at": e.earned_at.isoformat(),
+                    "platform_name": e.platform_name,
+                }
+                for e in earnings
+            ],
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -174,6 +213,5 @@ class DefaultPipelineFactory:
 # Module-level convenience  (for `from .router import router`)
 # ---------------------------------------------------------------------------
 
-_default_pipeline = DefaultPipelineFactory.create()
-_factory = IngestionRouterFactory(_default_pipeline)
-router = _factory.build()
+# Stateless: the pipeline itself is created by the app lifespan, not at import
+router = IngestionRouterFactory().build()
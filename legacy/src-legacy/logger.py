@@ -3,38 +3,97 @@ Logging configuration for Synthetic Liquidity Ledger
 Sets up structured logging throughout the application
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
+import threading
 from pathlib import Path
 from .config import settings
 
+# Records never render thread/process/caller info, so skip collecting it
+# (see "Optimization" in the logging HOWTO)
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging._srcfile = None
+
+LOG_LEVEL = getattr(logging, settings.LOG_LEVEL)
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders ``%(asctime)s`` at most once per second."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (-1, "")  # (epoch second, formatted) swapped atomically
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, text = self._time_cache
+        if second != cached_second:
+            text = super().formatTime(record, datefmt)
+            self._time_cache = (second, text)
+        return text
+
+
+class DeferredFileQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for a rotating log file written by a background thread.
+
+    Nothing touches the filesystem until the first record: only then are
+    the log directory, the RotatingFileHandler and its QueueListener
+    created. After that, callers only enqueue; the disk write happens on
+    the listener thread.
+    """
+
+    def __init__(self, path, formatter: logging.Formatter, level: int = logging.NOTSET):
+        super().__init__(queue.SimpleQueue())
+        self.setLevel(level)
+        self._path = Path(path)
+        self._file_formatter = formatter
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def _start_listener(self) -> None:
+        with self._start_lock:
+            if self._listener is not None:
+                return
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            target = logging.handlers.RotatingFileHandler(
+                self._path,
+                maxBytes=10_000_000,  # 10MB
+                backupCount=5,
+            )
+            target.setFormatter(self._file_formatter)
+            listener = logging.handlers.QueueListener(self.queue, target)
+            listener.start()
+            atexit.register(listener.stop)  # drains the queue before exit
+            self._listener = listener
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._listener is None:
+            self._start_listener()
+        super().emit(record)
+
+
 # Create logger
 logger = logging.getLogger(__name__)
-logger.setLevel(getattr(logging, settings.LOG_LEVEL))
+logger.setLevel(LOG_LEVEL)
 
 # Create formatters
-detailed_formatter = logging.Formatter(
+detailed_formatter = CachedTimeFormatter(
     '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
 # Console handler
 console_handler = logging.StreamHandler()
-console_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
+console_handler.setLevel(LOG_LEVEL)
 console_handler.setFormatter(detailed_formatter)
 logger.addHandler(console_handler)
 
-# File handler (rotating)
-log_file = Path(settings.LOG_FILE)
-log_file.parent.mkdir(parents=True, exist_ok=True)
-
-file_handler = logging.handlers.RotatingFileHandler(
-    settings.LOG_FILE,
-    maxBytes=10_000_000,  # 10MB
-    backupCount=5
-)
-file_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
-file_handler.setFormatter(detailed_formatter)
+# File handler (rotating, opened on first record, written off-thread)
+file_handler = DeferredFileQueueHandler(settings.LOG_FILE, detailed_formatter, LOG_LEVEL)
 logger.addHandler(file_handler)
 
 
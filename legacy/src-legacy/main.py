@@ -4,10 +4,10 @@ FastAPI application for cross-border liquidity, journal/postings, and settlement
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional
 
 from fastapi import FastAPI, HTTPException, Header, Query
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import csv
 import io
@@ -15,6 +15,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import requests # We use standard requests instead of httpx
 
+try:                                    # optional: orjson-backed responses
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+    _json_bytes = orjson.dumps
+except ImportError:
+    import json
+    DefaultResponse = JSONResponse
+
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 
 # Config
 CLIENT_ID = "3a7ea77b47d0441b811e152ae0e0bff5"
@@ -47,10 +58,10 @@ from .engine import (
     get_worker_balance,
     get_worker_transactions,
     get_worker_summary,
-    get_admin_transactions,
+    iter_admin_transactions,
     get_net_positions,
 )
-from .ingestion.router import router as ingestion_router
+from .ingestion.router import DefaultPipelineFactory, PIPELINE_STATE_ATTR, router as ingestion_router
 
 __version__ = "0.1.0"
 
@@ -61,6 +72,7 @@ async def lifespan(app: FastAPI):
     init_db()
     seed_sample_data()
     print("✓ Database initialized and seeded with sample data")
+    setattr(app.state, PIPELINE_STATE_ATTR, DefaultPipelineFactory.create())
     yield
     print("✓ Application shutdown")
 
@@ -70,6 +82,7 @@ app = FastAPI(
     description="Fintech API for cross-border liquidity management (PDF spec): payout, settle/run, admin/topup, state, metrics",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 # Mount Component 1 – Data Ingestion & Normalization pipeline
@@ -112,10 +125,14 @@ async def root():
     }
 
 
+# Static payload: built once, served as-is
+_HEALTH = HealthResponse.model_construct(status="healthy", version=__version__)
+
+
 @app.get("/health", tags=["info"], response_model=HealthResponse)
 async def health():
     """Health check."""
-    return {"status": "healthy", "version": __version__}
+    return _HEALTH
 
 
 # ============================================================================
@@ -127,10 +144,12 @@ async def state():
     """Get full ledger state: accounts, open obligations, queued payouts."""
     try:
         s = get_state()
-        return LedgerStateResponse(
-            accounts=[AccountResponse(**a) for a in s["accounts"]],
-            open_obligations=[ObligationResponse(**o) for o in s["open_obligations"]],
-            queued_payouts=[PayoutQueueItemResponse(**q) for q in s["queued_payouts"]],
+        # Rows come straight from our own tables (columns match the models),
+        # so build without per-row validation; response_model checks the result
+        return LedgerStateResponse.model_construct(
+            accounts=[AccountResponse.model_construct(**a) for a in s["accounts"]],
+            open_obligations=[ObligationResponse.model_construct(**o) for o in s["open_obligations"]],
+            queued_payouts=[PayoutQueueItemResponse.model_construct(**q) for q in s["queued_payouts"]],
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -280,6 +299,26 @@ async def list_workers():
 # Admin dashboard
 # ============================================================================
 
+# Rows encoded per chunk when streaming a JSON array
+STREAM_ROWS_PER_CHUNK = 256
+
+
+def _stream_json_array(rows: Iterable[Dict]) -> Iterator[bytes]:
+    """Encode *rows* as one JSON array, a chunk of rows at a time."""
+    yield b"["
+    parts = []
+    first = True
+    for row in rows:
+        parts.append(_json_bytes(row))
+        if len(parts) == STREAM_ROWS_PER_CHUNK:
+            yield (b"" if first else b",") + b",".join(parts)
+            first = False
+            parts = []
+    if parts:
+        yield (b"" if first else b",") + b",".join(parts)
+    yield b"]"
+
+
 @app.get("/admin/transactions", tags=["admin"])
 async def admin_transactions(
     limit: int = Query(200, le=500),
@@ -291,7 +330,7 @@ async def admin_transactions(
 ):
     """All transactions (journal entries + postings) with optional filters."""
     try:
-        return get_admin_transactions(
+        rows = iter_admin_transactions(
             limit=limit,
             offset=offset,
             from_ts=from_ts,
@@ -299,6 +338,8 @@ async def admin_transactions(
             type_filter=transaction_type,
             account_currency=currency,
         )
+        # Rows are built and encoded as the body is sent, never all at once
+        return StreamingResponse(_stream_json_array(rows), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -331,7 +372,7 @@ async def admin_export_transactions(
 ):
     """Export transactions as CSV."""
     try:
-        rows = get_admin_transactions(
+        rows = iter_admin_transactions(
             limit=5000,
             offset=0,
             from_ts=from_ts,
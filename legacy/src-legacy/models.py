@@ -2,7 +2,7 @@
 Pydantic models (schemas) for API requests and responses (PDF spec).
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 
@@ -28,7 +28,12 @@ class AdminTopupRequest(BaseModel):
 
 # ----- Response models -----
 
-class AccountResponse(BaseModel):
+class ResponseModel(BaseModel):
+    """Base for response schemas (also used by the ingestion router): immutable once built."""
+    model_config = ConfigDict(frozen=True)
+
+
+class AccountResponse(ResponseModel):
     """Account (pool) data for GET /state"""
     id: str
     kind: str
@@ -37,11 +42,10 @@ class AccountResponse(BaseModel):
     balance_minor: int
     min_buffer_minor: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class ObligationResponse(BaseModel):
+class ObligationResponse(ResponseModel):
     """Obligation data"""
     id: int
     from_pool: str
@@ -51,11 +55,10 @@ class ObligationResponse(BaseModel):
     created_at: Optional[int] = None
     settlement_batch_id: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class PayoutQueueItemResponse(BaseModel):
+class PayoutQueueItemResponse(ResponseModel):
     """Single queued payout"""
     id: int
     from_pool: str
@@ -65,14 +68,14 @@ class PayoutQueueItemResponse(BaseModel):
     created_at: Optional[int] = None
 
 
-class LedgerStateResponse(BaseModel):
+class LedgerStateResponse(ResponseModel):
     """Response for GET /state"""
     accounts: List[AccountResponse]
     open_obligations: List[ObligationResponse]
     queued_payouts: List[PayoutQueueItemResponse]
 
 
-class MetricsResponse(BaseModel):
+class MetricsResponse(ResponseModel):
     """Response for GET /metrics"""
     gross_usd_cents_open: int = Field(..., description="Sum of OPEN obligation amounts in USD cents")
     net_usd_cents_if_settle_now: int = Field(..., description="Sum of abs(net) per pair if settled now")
@@ -80,14 +83,14 @@ class MetricsResponse(BaseModel):
     transactions_today: int = Field(0, description="Journal entries created today")
 
 
-class SettlementDetails(BaseModel):
+class SettlementDetails(ResponseModel):
     """Single settlement (payer -> payee)"""
     payer: str
     payee: str
     amount_usd_cents: int
 
 
-class PayoutResponse(BaseModel):
+class PayoutResponse(ResponseModel):
     """Response for POST /payout (executed or queued)"""
     ok: bool
     queued: bool = False
@@ -98,7 +101,7 @@ class PayoutResponse(BaseModel):
     message: Optional[str] = None
 
 
-class SettleRunResponse(BaseModel):
+class SettleRunResponse(ResponseModel):
     """Response for POST /settle/run"""
     ok: bool
     settlement_batch_id: Optional[int] = None
@@ -107,7 +110,7 @@ class SettleRunResponse(BaseModel):
     message: Optional[str] = None
 
 
-class AdminTopupResponse(BaseModel):
+class AdminTopupResponse(ResponseModel):
     """Response for POST /admin/topup"""
     ok: bool
     account_id: str
@@ -115,13 +118,13 @@ class AdminTopupResponse(BaseModel):
     message: Optional[str] = None
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(ResponseModel):
     """Response for GET /health"""
     status: str
     version: str
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(ResponseModel):
     """Error response"""
     error: str
     detail: Optional[str] = None
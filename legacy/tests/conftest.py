@@ -0,0 +1,44 @@
+"""
+Shared fixtures for the legacy ledger tests.
+
+``src-legacy`` is not a valid module name, so the package is loaded from
+its path and registered as ``src_legacy``; tests import from that.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_NAME = "src_legacy"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "src-legacy"
+
+
+def _load_package() -> None:
+    if PACKAGE_NAME in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME,
+        PACKAGE_DIR / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = module
+    spec.loader.exec_module(module)
+
+
+_load_package()
+
+
+@pytest.fixture
+def ledger_db(tmp_path, monkeypatch):
+    """A freshly seeded ledger in a temporary SQLite file."""
+    from src_legacy import db
+
+    db.close_connections()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "ledger.db"))
+    db.init_db()
+    db.seed_sample_data()
+    yield db
+    db.close_connections()
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from src_legacy import engine
+
+POOLS = ["POOL_BR_BRL", "POOL_EU_EUR", "POOL_UK_GBP", "WORKER_1", "WORKER_2"]
+
+pytestmark = pytest.mark.skipif(engine.np is None, reason="NumPy netting needs numpy")
+
+
+def _obligations(rng: random.Random, n: int):
+    # Self-pairs (from_pool == to_pool) are included on purpose
+    return [
+        {
+            "id": rng.randrange(1, 10 * n),
+            "from_pool": rng.choice(POOLS),
+            "to_pool": rng.choice(POOLS),
+            "amount_usd_cents": rng.randint(1, 100_000),
+        }
+        for _ in range(n)
+    ]
+
+
+def _loop(obligations, monkeypatch):
+    monkeypatch.setattr(engine, "NUMPY_MIN_OBLIGATIONS", len(obligations))
+    return engine._compute_net_positions(obligations)
+
+
+@pytest.mark.parametrize("have_numba", [True, False], ids=["kernel", "vectorised"])
+@pytest.mark.parametrize("n", [1, 2, 17, 300, 1000])
+def test_numpy_netting_matches_loop(n, have_numba, monkeypatch) -> None:
+    monkeypatch.setattr(engine, "HAVE_NUMBA", have_numba)
+    for seed in range(20):
+        obligations = _obligations(random.Random(seed), n)
+        expected_nets, expected_ids = _loop(obligations, monkeypatch)
+        nets, ids = engine._compute_net_positions_numpy(obligations)
+
+        assert nets == expected_nets
+        assert list(nets) == list(expected_nets)    # pair order: first appearance
+        assert ids == expected_ids                  # id order within each pair
+
+
+@pytest.mark.parametrize("have_numba", [True, False], ids=["kernel", "vectorised"])
+def test_self_pair_nets_positive(have_numba, monkeypatch) -> None:
+    monkeypatch.setattr(engine, "HAVE_NUMBA", have_numba)
+    obligations = [
+        {"id": 1, "from_pool": "WORKER_1", "to_pool": "WORKER_1", "amount_usd_cents": 500},
+        {"id": 2, "from_pool": "POOL_UK_GBP", "to_pool": "POOL_BR_BRL", "amount_usd_cents": 300},
+        {"id": 3, "from_pool": "WORKER_1", "to_pool": "WORKER_1", "amount_usd_cents": 200},
+    ]
+    nets, ids = engine._compute_net_positions_numpy(obligations)
+
+    assert nets == {("WORKER_1", "WORKER_1"): 700, ("POOL_BR_BRL", "POOL_UK_GBP"): -300}
+    assert ids == {("WORKER_1", "WORKER_1"): [1, 3], ("POOL_BR_BRL", "POOL_UK_GBP"): [2]}
+    assert (nets, ids) == _loop(obligations, monkeypatch)
@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from src_legacy import engine
+
+DUPLICATE = "Duplicate request ignored (idempotent)"
+
+
+def _forget_remembered_payouts(db) -> None:
+    # Simulates eviction from (or a restart emptying) the external_id LRU
+    with db._external_id_cache_lock:
+        db._external_id_cache.clear()
+
+
+def _entries_with_external_id(db, external_id: str) -> int:
+    return db.execute_query(
+        "SELECT COUNT(*) AS c FROM journal_entries WHERE external_id = ?",
+        (external_id,),
+        one=True,
+    )["c"]
+
+
+def _count(db, table: str) -> int:
+    return db.execute_query(f"SELECT COUNT(*) AS c FROM {table}", one=True)["c"]
+
+
+def _balance(db, account_id: str) -> int:
+    return db.fetch_account(account_id)["balance_minor"]
+
+
+def test_retry_without_cache_returns_original_payout(ledger_db) -> None:
+    db = ledger_db
+    first = engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-retry")
+    assert first["message"] == "Payout executed"
+    balance = _balance(db, "WORKER_1")
+    obligations = _count(db, "obligations")
+
+    _forget_remembered_payouts(db)
+    retry = engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-retry")
+
+    assert retry["message"] == DUPLICATE
+    assert retry["journal_entry_id"] == first["journal_entry_id"]
+    assert retry["obligation_id"] == first["obligation_id"]
+    assert _entries_with_external_id(db, "idem-retry") == 1
+    assert _count(db, "obligations") == obligations
+    assert _balance(db, "WORKER_1") == balance
+    assert not db.get_connection().in_transaction
+
+
+def test_queued_conflict_rolls_back_queue_row(ledger_db) -> None:
+    db = ledger_db
+    first = engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-queued")
+    queued = _count(db, "payout_queue")
+
+    # Too large for WORKER_1's balance, so the retry takes the queued branch
+    # and its payout_queue insert must be undone when the entry conflicts
+    _forget_remembered_payouts(db)
+    retry = engine.payout("POOL_UK_GBP", "WORKER_1", 10**9, "idem-queued")
+
+    assert retry["message"] == DUPLICATE
+    assert retry["journal_entry_id"] == first["journal_entry_id"]
+    assert _count(db, "payout_queue") == queued
+    assert _entries_with_external_id(db, "idem-queued") == 1
+    assert not db.get_connection().in_transaction
+
+
+def test_retry_without_fx_rate_returns_original_payout(ledger_db) -> None:
+    db = ledger_db
+    first = engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-fx")
+    db.execute_query("DELETE FROM fx_rates WHERE currency = 'GBP'", fetch=False)
+    db.invalidate_fx_cache("GBP")
+
+    _forget_remembered_payouts(db)
+    retry = engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-fx")
+
+    assert retry["message"] == DUPLICATE
+    assert retry["journal_entry_id"] == first["journal_entry_id"]
+    assert retry["obligation_id"] == first["obligation_id"]
+    # A new key still cannot be priced
+    with pytest.raises(HTTPException) as exc:
+        engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-fx-new")
+    assert exc.value.status_code == 400
+
+
+def test_concurrent_requests_with_one_key_execute_once(ledger_db) -> None:
+    db = ledger_db
+    balance = _balance(db, "WORKER_1")
+    workers = 8
+    start = threading.Barrier(workers)
+
+    def request(_):
+        start.wait()
+        return engine.payout("POOL_UK_GBP", "WORKER_1", 1000, "idem-race")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(request, range(workers)))
+
+    assert [r["message"] for r in results].count("Payout executed") == 1
+    assert len({r["journal_entry_id"] for r in results}) == 1
+    assert _entries_with_external_id(db, "idem-race") == 1
+    assert _balance(db, "WORKER_1") == balance - 1000